@@ -0,0 +1,91 @@
+"""Compare flattened translation catalogs against the previous nested lookup.
+
+Run with ``python benchmarks/bench_i18n.py``. The legacy implementation below
+is the pre-flattening ``translate``: split the dotted key, walk the nested
+catalog, walk the English catalog again on a miss, then ``str.format``.
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from vehiclecodescan.utils.i18n import DEFAULT_LANGUAGE, _load_language, translate, translate_many
+
+KEYS = [
+    ("report.title", {}),
+    ("report.generated_on", {"timestamp": "2024-01-01 12:00 UTC"}),
+    ("report.diagnostics.code", {}),
+    ("upload.success.message", {"report_id": "0123456789abcdef"}),
+    ("severity.high", {}),
+    ("report.unknown_code_description", {"code": "P9999"}),
+]
+HEADER_KEYS = [
+    "report.diagnostics.code",
+    "report.diagnostics.status",
+    "report.diagnostics.severity",
+    "report.diagnostics.description",
+    "report.diagnostics.recommendation",
+]
+
+
+def _legacy_lookup(data: dict[str, Any], key: str) -> Any:
+    current: Any = data
+    for part in key.split("."):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def legacy_translate(key: str, language: str, default: str | None = None, **kwargs: Any) -> str:
+    value = _legacy_lookup(_load_language(language), key)
+    if value is None and language != DEFAULT_LANGUAGE:
+        value = _legacy_lookup(_load_language(DEFAULT_LANGUAGE), key)
+    if value is None:
+        value = default if default is not None else key
+    if isinstance(value, str):
+        return value.format(**kwargs)
+    return str(value)
+
+
+def _bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_call = seconds / number * 1e9
+    print(f"{label:<28} {per_call:10.0f} ns/iter")
+    return per_call
+
+
+def main(number: int = 20000) -> None:
+    for language in ("en", "es", "fr"):
+        translate("report.title", language)
+        legacy_translate("report.title", language)
+        print(f"language={language}")
+        legacy = _bench(
+            "  legacy translate",
+            lambda: [legacy_translate(key, language, **kwargs) for key, kwargs in KEYS],
+            number,
+        )
+        current = _bench(
+            "  flattened translate",
+            lambda: [translate(key, language, **kwargs) for key, kwargs in KEYS],
+            number,
+        )
+        print(f"  speedup                    {legacy / current:10.2f}x")
+        legacy_header = _bench(
+            "  legacy header row",
+            lambda: [legacy_translate(key, language) for key in HEADER_KEYS],
+            number,
+        )
+        bulk_header = _bench("  translate_many header row", lambda: translate_many(HEADER_KEYS, language), number)
+        print(f"  speedup                    {legacy_header / bulk_header:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Time report search against a large synthetic metadata DB.
+
+    python benchmarks/bench_search.py --reports 200000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from vehiclecodescan.config import Settings  # noqa: E402
+from vehiclecodescan.storage import models  # noqa: E402
+
+CODES = [("P0300", "Random misfire detected"), ("P0420", "Catalyst efficiency below threshold"),
+         ("P0171", "System too lean bank 1"), ("U0100", "Lost communication with ECM")]
+NOTES = ["Rough idle when cold", "Check engine light on", "Hesitation on acceleration", ""]
+
+
+def _populate(settings: Settings, count: int) -> None:
+    models.init_db(settings)
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    reports = []
+    index_rows = []
+    for index in range(count):
+        metadata = {
+            "email": f"customer{index}@example.com",
+            "vehicle": {"vin": f"1HGCM82633A{index:06d}", "notes": rng.choice(NOTES)},
+            "codes": [{"code": code, "description": text} for code, text in rng.sample(CODES, 2)],
+        }
+        # Scans arrive out of order, as batch imports of older submissions do.
+        created_at = (now - timedelta(minutes=rng.randrange(count))).isoformat()
+        reports.append((index + 1, f"report{index}", created_at, json.dumps(metadata), 0, created_at))
+        index_rows.append((index + 1, *models.search_fields(metadata)))
+    with sqlite3.connect(settings.storage_root / "metadata.db") as conn:
+        conn.executemany(
+            "INSERT INTO reports (id, report_id, created_at, metadata, total_bytes, last_accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            reports,
+        )
+        conn.executemany(
+            "INSERT INTO reports_fts (rowid, vin, email, notes, codes) VALUES (?, ?, ?, ?, ?)", index_rows
+        )
+        conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="vcs-search-") as scratch:
+        root = Path(scratch)
+        settings = Settings(
+            secret_key="bench",
+            storage_root=root,
+            upload_dir=root / "uploads",
+            report_dir=root / "reports",
+            mail=None,
+            admin_username="",
+            admin_password="",
+        )
+        started = time.perf_counter()
+        _populate(settings, args.reports)
+        print(f"Indexed {args.reports} reports in {time.perf_counter() - started:.1f}s")
+        for query in ["A012345", "customer4242@", "catalyst", "P0171 idle", "ECM hesitation"]:
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                total, _, _ = models.search_reports(settings, query)
+            elapsed = (time.perf_counter() - started) / args.repeat * 1000
+            print(f"{query!r:>20}: {total:>7} matches, {elapsed:.2f} ms per page")
+        record = models.get_report(settings, "report4242")
+        started = time.perf_counter()
+        models.store_report(settings, "report4242", record.metadata)
+        print(f"Re-storing one report: {(time.perf_counter() - started) * 1000:.2f} ms")
+        started = time.perf_counter()
+        models.delete_reports(settings, [f"report{index}" for index in range(500)])
+        print(f"Deleting a batch of 500: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure cold import time of each entry point with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter, ``--repeat`` times, and the
+fastest run is reported along with the packages that account for most of it. Entry points that
+must stay light fail the run if they pull in Flask, Werkzeug or ReportLab.
+
+    python benchmarks/importtime.py --top 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# module -> top-level packages it must not import
+ENTRY_POINTS = {
+    "vehiclecodescan.cron.purge": ("flask", "werkzeug", "reportlab"),
+    "vehiclecodescan.cron.tier": ("flask", "werkzeug", "reportlab"),
+    "vehiclecodescan.email.outbox": ("flask", "werkzeug", "reportlab"),
+    "vehiclecodescan.report.batch": ("flask", "werkzeug"),
+    "vehiclecodescan.app": (),
+}
+
+
+def _measure(module: str) -> list[tuple[str, int, int]]:
+    """Return ``(name, self_us, cumulative_us)`` for every import of ``module``."""
+    paths = [str(PROJECT_ROOT / "src"), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, paths))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point; the fastest is kept")
+    parser.add_argument("--top", type=int, default=5, help="heaviest packages to list per entry point")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = {}
+    failed = False
+    for module, forbidden in ENTRY_POINTS.items():
+        runs = [_measure(module) for _ in range(max(args.repeat, 1))]
+        rows = min(runs, key=lambda run: next(cum for name, _, cum in run if name == module))
+        total = next(cum for name, _, cum in rows if name == module)
+        packages = {name.split(".")[0] for name, _, _ in rows}
+        leaked = sorted(packages & set(forbidden))
+        failed = failed or bool(leaked)
+        by_package: dict[str, int] = {}
+        for name, self_us, _ in rows:
+            package = name.split(".")[0]
+            by_package[package] = by_package.get(package, 0) + self_us
+        heaviest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+        summary[module] = {
+            "total_ms": round(total / 1000, 1),
+            "modules": len(rows),
+            "forbidden_imports": leaked,
+            "heaviest": [{"package": name, "self_ms": round(us / 1000, 1)} for name, us in heaviest[: args.top]],
+        }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for module, result in summary.items():
+            status = f"  IMPORTS {', '.join(result['forbidden_imports'])}" if result["forbidden_imports"] else ""
+            heaviest = ", ".join(f"{item['package']} {item['self_ms']}" for item in result["heaviest"])
+            print(f"{module:<32} {result['total_ms']:>7.1f} ms  {result['modules']:>4} modules{status}")
+            print(f"{'':<32} by package (ms): {heaviest}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
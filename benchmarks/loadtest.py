@@ -0,0 +1,254 @@
+"""End-to-end load test for the upload endpoint.
+
+Starts ``--workers`` processes that each serve the real Flask app (threaded
+Werkzeug server) against a temporary storage root and an in-process SMTP
+stand-in, then drives concurrent authenticated multipart uploads to ``/`` with
+synthetic scanner exports and JPEG photos. Prints throughput, latency
+percentiles, the status breakdown, delivered emails and per-worker memory.
+
+    python benchmarks/loadtest.py --workers 2 --concurrency 8 --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import http.client
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+USERNAME = "loadtest"
+PASSWORD = "loadtest"
+UNKNOWN_CODES = ["P1A2B", "U0420", "B1234", "C0561"]
+
+
+def _current_rss_kb() -> int:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _serve(index: int, ports: multiprocessing.Queue, stats: multiprocessing.Queue, stop: Any) -> None:
+    from werkzeug.serving import make_server
+
+    from vehiclecodescan.app import create_app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = create_app()
+    baseline = _current_rss_kb()
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    ports.put(server.server_port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stop.wait()
+    server.shutdown()
+    stats.put(
+        {
+            "worker": index,
+            "pid": os.getpid(),
+            "baseline_kb": baseline,
+            "rss_kb": _current_rss_kb(),
+            "peak_kb": _peak_rss_kb(),
+        }
+    )
+
+
+def _build_photo(size: int) -> bytes:
+    from PIL import Image
+
+    image = Image.new("RGB", (size, size))
+    pixels = image.load()
+    for x in range(0, size, 8):
+        for y in range(0, size, 8):
+            pixels[x, y] = (x % 256, y % 256, (x * y) % 256)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def _build_scanner_file(known_codes: list[str], count: int) -> bytes:
+    rows = ["Code,Status,Description"]
+    statuses = ["Pending", "Stored", "History", "Permanent"]
+    for _ in range(count):
+        code = random.choice(known_codes + UNKNOWN_CODES)
+        rows.append(f"{code},{random.choice(statuses)},synthetic")
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+def _multipart(fields: dict[str, str], files: list[tuple[str, str, str, bytes]]) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for name, value in fields.items():
+        body.write(f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n".encode())
+    for name, filename, content_type, data in files:
+        body.write(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n".encode()
+        )
+        body.write(data)
+        body.write(b"\r\n")
+    body.write(f"--{boundary}--\r\n".encode())
+    return body.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2, help="server processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=100, help="total uploads to send")
+    parser.add_argument("--codes", type=int, default=12, help="diagnostic codes per scanner file")
+    parser.add_argument("--photos", type=int, default=2, help="JPEG photos per upload")
+    parser.add_argument("--photo-size", type=int, default=640, help="photo edge length in pixels")
+    parser.add_argument("--max-renders", type=int, default=4, help="APP_MAX_CONCURRENT_RENDERS per worker")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    storage = tempfile.TemporaryDirectory(prefix="vcs-load-")
+    os.environ.update(
+        {
+            "APP_STORAGE_ROOT": storage.name,
+            "APP_USERNAME": USERNAME,
+            "APP_PASSWORD": PASSWORD,
+            "APP_RATE_LIMIT_PER_MINUTE": "0",
+            "APP_MAX_CONCURRENT_RENDERS": str(args.max_renders),
+            "APP_ADMISSION_TIMEOUT": "60",
+        }
+    )
+    from vehiclecodescan.email.testing import LocalSMTPServer
+
+    smtp = LocalSMTPServer().start()
+    os.environ.update(
+        {
+            "MAIL_SERVER": smtp.host,
+            "MAIL_PORT": str(smtp.port),
+            "MAIL_USERNAME": "",
+            "MAIL_USE_TLS": "false",
+            "OUTBOX_POLL_INTERVAL": "1",
+        }
+    )
+
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    ports: multiprocessing.Queue = context.Queue()
+    stats: multiprocessing.Queue = context.Queue()
+    stop = context.Event()
+    processes = [context.Process(target=_serve, args=(index, ports, stats, stop)) for index in range(args.workers)]
+    for process in processes:
+        process.start()
+    server_ports = [ports.get(timeout=60) for _ in processes]
+
+    from vehiclecodescan.parser.interpret import _load_database
+
+    known_codes = sorted(_load_database()) or ["P0300"]
+    photo = _build_photo(args.photo_size)
+    auth = "Basic " + base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode()
+    local = threading.local()
+
+    def upload(sequence: int) -> tuple[int, float]:
+        port = server_ports[sequence % len(server_ports)]
+        connections = getattr(local, "connections", None)
+        if connections is None:
+            connections = local.connections = {}
+        fields = {
+            "email": f"customer{sequence}@example.com",
+            "language": random.choice(["en", "es"]),
+            "vin": f"1HGCM82633A{sequence:06d}",
+            "mileage": "84,000",
+            "notes": "Load test",
+        }
+        body, content_type = _multipart(
+            fields,
+            [("scanner_file", "scan.csv", "text/csv", _build_scanner_file(known_codes, args.codes))]
+            + [("images", f"photo{index}.jpg", "image/jpeg", photo) for index in range(args.photos)],
+        )
+        started = time.perf_counter()
+        try:
+            connection = connections.get(port) or http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+            connections[port] = connection
+            connection.request("POST", "/", body=body, headers={"Authorization": auth, "Content-Type": content_type})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connections.pop(port, None)
+            status = 0
+        return status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(upload, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    deadline = time.monotonic() + 30
+    ok = sum(1 for status, _ in results if status == 200)
+    while len(smtp.messages) < ok and time.monotonic() < deadline:
+        time.sleep(0.2)
+
+    stop.set()
+    workers = sorted((stats.get(timeout=30) for _ in processes), key=lambda item: item["worker"])
+    for process in processes:
+        process.join()
+    smtp.stop()
+    storage.cleanup()
+
+    latencies = sorted(latency for status, latency in results if status == 200)
+    summary = {
+        "requests": args.requests,
+        "succeeded": ok,
+        "statuses": dict(Counter(status for status, _ in results)),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            f"p{percent}": round(_percentile(latencies, percent) * 1000, 1) for percent in (50, 95, 99)
+        },
+        "emails_delivered": len(smtp.messages),
+        "workers": workers,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"Uploads:     {ok}/{args.requests} succeeded in {elapsed:.2f}s, statuses {summary['statuses']}")
+    print(f"Throughput:  {summary['throughput_rps']} uploads/s across {args.workers} workers")
+    latency = summary["latency_ms"]
+    print(f"Latency:     p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms")
+    print(f"Emails:      {summary['emails_delivered']} delivered to the SMTP stand-in")
+    for worker in workers:
+        print(
+            f"Worker {worker['worker']}:    pid {worker['pid']}, rss {worker['rss_kb'] / 1024:.1f} MiB "
+            f"(after warm-up {worker['baseline_kb'] / 1024:.1f} MiB, peak {worker['peak_kb'] / 1024:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,45 @@
 from __future__ import annotations
 
+import gc
 from pathlib import Path
 
-from flask import Flask
+from flask import Flask, current_app
 
 from .config import get_settings
+from .email.outbox import start_sender
+from .parser.interpret import preload_code_database
+from .report.generator import preload_report_assets
+from .utils.i18n import preload_catalogs
+from .web.limits import EXTENSION_KEY as ADMISSION_EXTENSION_KEY, AdmissionController
 from .web.routes import web_bp
 
 
+def warm_up(app: Flask) -> None:
+    """Load shared read-only data before workers are forked.
+
+    When the app is imported by a preloading pre-fork server (``gunicorn
+    --preload``) the code database, translation catalogs, ReportLab styles and
+    fonts, and the upload template are built once in the master. Freezing the
+    collector afterwards keeps those objects out of later collections, so the
+    pages stay shared copy-on-write instead of being copied by each worker.
+    """
+    preload_code_database()
+    preload_catalogs()
+    preload_report_assets()
+    app.jinja_env.get_template("upload.html")
+    gc.collect()
+    gc.freeze()
+
+
+def _start_outbox_sender() -> None:
+    # Runs before every request but only starts the thread once per worker, so
+    # queued and retrying mail is delivered after a restart without waiting
+    # for the next upload. A preloading master never serves requests.
+    settings = current_app.config["SETTINGS"]
+    if settings.mail is not None and settings.outbox_background:
+        start_sender(settings)
+
+
 def create_app() -> Flask:
     settings = get_settings()
     root_dir = Path(__file__).resolve().parents[2]
@@ -16,9 +48,20 @@ def create_app() -> Flask:
     app = Flask(__name__, template_folder=str(template_folder), static_folder=str(static_folder))
     app.config["SETTINGS"] = settings
     app.secret_key = settings.secret_key
+    app.config["USE_X_SENDFILE"] = settings.use_x_sendfile
+    app.extensions[ADMISSION_EXTENSION_KEY] = AdmissionController.from_settings(settings)
 
     app.register_blueprint(web_bp)
+    app.before_request(_start_outbox_sender)
+    if settings.preload_assets:
+        warm_up(app)
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> Flask:
+    # ``vehiclecodescan.app:app`` (gunicorn, ``flask --app``) is created on first
+    # access rather than at import, so importing ``create_app`` has no side effects.
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -18,6 +18,9 @@ class MailSettings:
     password: str
     sender: str
     use_tls: bool = True
+    pool_size: int = 4
+    pool_idle_timeout: float = 60.0
+    attachment_limit: int = 10 * 1024 * 1024
 
 
 @dataclass
@@ -29,6 +32,30 @@ class Settings:
     mail: Optional[MailSettings]
     admin_username: str
     admin_password: str
+    preload_assets: bool = True
+    rate_limit_per_minute: float = 30.0
+    rate_limit_burst: int = 10
+    max_concurrent_renders: int = 4
+    render_processes: int = 2
+    admission_timeout: float = 5.0
+    outbox_concurrency: int = 2
+    outbox_max_attempts: int = 8
+    outbox_base_delay: float = 30.0
+    outbox_max_delay: float = 3600.0
+    outbox_poll_interval: float = 15.0
+    outbox_background: bool = True
+    use_x_sendfile: bool = False
+    download_link_ttl: int = 7 * 24 * 3600
+    # Public base URL of the web app, for links built outside a request (batch CLI).
+    external_url: str = ""
+    tier_after_days: int = 7
+    tier_codec: str = "gzip"
+    storage_budget_bytes: int = 0
+    eviction_policy: str = "oldest"
+    max_image_pixels: int = 40_000_000
+    max_image_dimension: int = 12_000
+    profile_uploads: bool = False
+    profile_keep: int = 50
 
 
 def get_settings() -> Settings:
@@ -41,6 +68,29 @@ def get_settings() -> Settings:
     secret_key = os.environ.get("APP_SECRET_KEY", "development-secret")
     admin_username = os.environ.get("APP_USERNAME", "admin")
     admin_password = os.environ.get("APP_PASSWORD", "password")
+    preload_assets = os.environ.get("APP_PRELOAD", "true").lower() == "true"
+    rate_limit_per_minute = float(os.environ.get("APP_RATE_LIMIT_PER_MINUTE", "30"))
+    rate_limit_burst = int(os.environ.get("APP_RATE_LIMIT_BURST", "10"))
+    max_concurrent_renders = int(os.environ.get("APP_MAX_CONCURRENT_RENDERS", "4"))
+    render_processes = int(os.environ.get("APP_RENDER_PROCESSES", "2"))
+    admission_timeout = float(os.environ.get("APP_ADMISSION_TIMEOUT", "5"))
+    outbox_concurrency = int(os.environ.get("OUTBOX_CONCURRENCY", "2"))
+    outbox_max_attempts = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+    outbox_base_delay = float(os.environ.get("OUTBOX_BASE_DELAY", "30"))
+    outbox_max_delay = float(os.environ.get("OUTBOX_MAX_DELAY", "3600"))
+    outbox_poll_interval = float(os.environ.get("OUTBOX_POLL_INTERVAL", "15"))
+    outbox_background = os.environ.get("OUTBOX_BACKGROUND", "true").lower() == "true"
+    use_x_sendfile = os.environ.get("APP_USE_X_SENDFILE", "false").lower() == "true"
+    download_link_ttl = int(os.environ.get("APP_DOWNLOAD_LINK_TTL", str(7 * 24 * 3600)))
+    external_url = os.environ.get("APP_EXTERNAL_URL", "")
+    tier_after_days = int(os.environ.get("APP_TIER_AFTER_DAYS", "7"))
+    tier_codec = os.environ.get("APP_TIER_CODEC", "gzip")
+    storage_budget_bytes = int(os.environ.get("APP_STORAGE_BUDGET_BYTES", "0"))
+    eviction_policy = os.environ.get("APP_EVICTION_POLICY", "oldest")
+    max_image_pixels = int(os.environ.get("APP_MAX_IMAGE_PIXELS", "40000000"))
+    max_image_dimension = int(os.environ.get("APP_MAX_IMAGE_DIMENSION", "12000"))
+    profile_uploads = os.environ.get("APP_PROFILE", "false").lower() == "true"
+    profile_keep = int(os.environ.get("APP_PROFILE_KEEP", "50"))
 
     if "MAIL_SERVER" in os.environ:
         mail = MailSettings(
@@ -50,6 +100,9 @@ def get_settings() -> Settings:
             password=os.environ.get("MAIL_PASSWORD", ""),
             sender=os.environ.get("MAIL_SENDER", "reports@example.com"),
             use_tls=os.environ.get("MAIL_USE_TLS", "true").lower() == "true",
+            pool_size=int(os.environ.get("MAIL_POOL_SIZE", "4")),
+            pool_idle_timeout=float(os.environ.get("MAIL_POOL_IDLE_TIMEOUT", "60")),
+            attachment_limit=int(os.environ.get("MAIL_ATTACHMENT_LIMIT", str(10 * 1024 * 1024))),
         )
     else:
         mail = None
@@ -62,4 +115,27 @@ def get_settings() -> Settings:
         mail=mail,
         admin_username=admin_username,
         admin_password=admin_password,
+        preload_assets=preload_assets,
+        rate_limit_per_minute=rate_limit_per_minute,
+        rate_limit_burst=rate_limit_burst,
+        max_concurrent_renders=max_concurrent_renders,
+        render_processes=render_processes,
+        admission_timeout=admission_timeout,
+        outbox_concurrency=outbox_concurrency,
+        outbox_max_attempts=outbox_max_attempts,
+        outbox_base_delay=outbox_base_delay,
+        outbox_max_delay=outbox_max_delay,
+        outbox_poll_interval=outbox_poll_interval,
+        outbox_background=outbox_background,
+        use_x_sendfile=use_x_sendfile,
+        download_link_ttl=download_link_ttl,
+        external_url=external_url,
+        tier_after_days=tier_after_days,
+        tier_codec=tier_codec,
+        storage_budget_bytes=storage_budget_bytes,
+        eviction_policy=eviction_policy,
+        max_image_pixels=max_image_pixels,
+        max_image_dimension=max_image_dimension,
+        profile_uploads=profile_uploads,
+        profile_keep=profile_keep,
     )
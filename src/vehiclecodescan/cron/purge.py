@@ -1,37 +1,218 @@
 from __future__ import annotations
 
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, Iterator, Sequence
 
-from ..config import get_settings
+from ..config import Settings, get_settings
 from ..storage import models
-from ..utils.files import remove_files
+from ..utils.files import remove_file
 
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 8
+# Files younger than this are never treated as orphans: an upload in progress
+# writes its files before the report row is stored.
+ORPHAN_GRACE = timedelta(hours=1)
 
-def purge_expired(days: int = 30) -> None:
-    settings = get_settings()
+
+@dataclass
+class PurgeSummary:
+    reports: int = 0
+    files: int = 0
+    bytes: int = 0
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _remove_reports(
+    executor: ThreadPoolExecutor,
+    settings: Settings,
+    report_ids: Sequence[str],
+    metadata: Sequence[dict[str, Any]],
+    dry_run: bool,
+    summary: PurgeSummary,
+) -> None:
+    """Delete one batch: files in parallel first, then the rows in one commit."""
+    paths = [path for item in metadata for path in models.report_file_paths(item)]
+    if dry_run:
+        freed = list(executor.map(_file_size, paths))
+    else:
+        freed = list(executor.map(remove_file, paths))
+        models.delete_reports(settings, report_ids)
+    summary.reports += len(report_ids)
+    summary.files += sum(1 for size in freed if size)
+    summary.bytes += sum(freed)
+
+
+def purge_expired(
+    days: int = 30,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+) -> PurgeSummary:
+    """Delete reports older than ``days`` in committed batches.
+
+    Each batch removes its files first and then its rows, so an interrupted run
+    leaves at most one batch of rows whose files are already gone; re-running
+    simply finishes them off.
+    """
+    settings = settings or get_settings()
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    expired = models.get_reports_older_than(settings, cutoff)
-    if not expired:
+    summary = PurgeSummary()
+    after: tuple[str, str] | None = None
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while True:
+            batch = models.get_reports_older_than_batch(settings, cutoff, batch_size, after)
+            if not batch:
+                break
+            _remove_reports(
+                executor,
+                settings,
+                [record.report_id for record in batch],
+                [record.metadata for record in batch],
+                dry_run,
+                summary,
+            )
+            if dry_run:
+                # Rows are not deleted, so page past this batch explicitly.
+                last = batch[-1]
+                after = (last.sort_key, last.report_id)
+    if not summary.reports:
         print("No expired reports to purge.")
+    else:
+        verb = "Would purge" if dry_run else "Purged"
+        print(
+            f"{verb} {summary.reports} reports older than {days} days "
+            f"({summary.files} files, {summary.bytes} bytes)."
+        )
+    return summary
+
+
+def evict_to_budget(
+    max_bytes: int,
+    policy: str = "oldest",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+) -> PurgeSummary:
+    """Evict reports until their tracked size fits in ``max_bytes``.
+
+    Usage comes from the ``total_bytes`` column, so only the metadata DB is
+    read. ``policy`` picks the victims: ``"oldest"`` by creation time or
+    ``"lru"`` by last download.
+    """
+    if policy not in models.EVICTION_ORDER:
+        raise ValueError(f"Unknown eviction policy: {policy}")
+    settings = settings or get_settings()
+    usage = models.total_storage_bytes(settings)
+    summary = PurgeSummary()
+    after: tuple[str, str] | None = None
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while usage > max_bytes:
+            candidates = models.get_eviction_candidates(settings, policy, batch_size, after)
+            if not candidates:
+                break
+            victims = []
+            for candidate in candidates:
+                if usage <= max_bytes:
+                    break
+                victims.append(candidate)
+                usage -= candidate.total_bytes
+            _remove_reports(
+                executor,
+                settings,
+                [victim.report_id for victim in victims],
+                [victim.metadata for victim in victims],
+                dry_run,
+                summary,
+            )
+            if dry_run:
+                last = victims[-1]
+                after = (last.sort_key, last.report_id)
+    verb = "Would evict" if dry_run else "Evicted"
+    print(
+        f"{verb} {summary.reports} reports ({summary.files} files, {summary.bytes} bytes); "
+        f"{usage} of {max_bytes} budgeted bytes in use."
+    )
+    return summary
+
+
+def _report_id_for(filename: str) -> str:
+    return filename.split(".", 1)[0].split("_", 1)[0]
+
+
+def _scan_files(directory: Path) -> Iterator[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry
+    except FileNotFoundError:
         return
-    to_delete_ids = []
-    for record in expired:
-        metadata = record.metadata
-        paths: list[Path] = []
-        scanner_path = metadata.get("scanner_file")
-        if scanner_path:
-            paths.append(Path(scanner_path))
-        pdf_path = metadata.get("pdf_path")
-        if pdf_path:
-            paths.append(Path(pdf_path))
-        for image_path in metadata.get("image_paths", []):
-            paths.append(Path(image_path))
-        remove_files(paths)
-        to_delete_ids.append(record.report_id)
-    models.delete_reports(settings, to_delete_ids)
-    print(f"Purged {len(to_delete_ids)} reports older than {days} days.")
+
+
+def sweep_orphans(
+    dry_run: bool = False,
+    grace: timedelta = ORPHAN_GRACE,
+    settings: Settings | None = None,
+) -> PurgeSummary:
+    """Remove upload and report files whose report has no metadata row."""
+    settings = settings or get_settings()
+    known_ids = set(models.iter_report_ids(settings))
+    newest_allowed = time.time() - grace.total_seconds()
+    summary = PurgeSummary()
+    for directory in (settings.upload_dir, settings.report_dir):
+        for entry in _scan_files(directory):
+            if _report_id_for(entry.name) in known_ids:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > newest_allowed:
+                continue
+            freed = stat.st_size if dry_run else remove_file(entry.path)
+            summary.files += 1
+            summary.bytes += freed
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"{verb} {summary.files} orphaned files ({summary.bytes} bytes).")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired reports and orphaned files.")
+    parser.add_argument("--days", type=int, default=30, help="retention period in days")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel file deletions")
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=None,
+        help="storage budget; evict reports until usage fits (default APP_STORAGE_BUDGET_BYTES)",
+    )
+    parser.add_argument("--policy", choices=sorted(models.EVICTION_ORDER), default=None)
+    parser.add_argument("--sweep-orphans", action="store_true", help="also remove files without a DB row")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be removed")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    purge_expired(args.days, args.batch_size, args.workers, args.dry_run, settings)
+    max_bytes = args.max_bytes if args.max_bytes is not None else settings.storage_budget_bytes
+    if max_bytes > 0:
+        policy = args.policy or settings.eviction_policy
+        evict_to_budget(max_bytes, policy, args.batch_size, args.workers, args.dry_run, settings)
+    if args.sweep_orphans:
+        sweep_orphans(args.dry_run, settings=settings)
 
 
 if __name__ == "__main__":
-    purge_expired()
+    main()
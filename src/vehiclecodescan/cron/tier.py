@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from ..config import Settings, get_settings
+from ..storage import models
+from ..utils.files import COMPRESSED_SUFFIXES, remove_file, zstandard
+
+CODEC_SUFFIXES = {codec: suffix for suffix, codec in COMPRESSED_SUFFIXES.items()}
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class TierSummary:
+    files: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def _compress(source: Path, target: Path, codec: str) -> None:
+    temp = target.with_name(target.name + ".tmp")
+    with source.open("rb") as src, temp.open("wb") as raw:
+        if codec == "gzip":
+            with gzip.GzipFile(filename=source.name, mode="wb", fileobj=raw, mtime=0) as dst:
+                shutil.copyfileobj(src, dst)
+        else:
+            zstandard.ZstdCompressor(level=10).copy_stream(src, raw)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(temp, target)
+
+
+def compress_aging_uploads(
+    days: int = 7,
+    codec: str = "gzip",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    settings: Settings | None = None,
+) -> TierSummary:
+    """Recompress scanner exports of reports older than ``days``.
+
+    The compressed copy is written and fsynced next to the original, the
+    metadata row is switched to it with a compare-and-set update, and only then
+    is the original removed. A crash at any point leaves a row that points at
+    a complete file; leftovers are cleaned up on the next run.
+    """
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unsupported codec: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("zstandard is required for the zstd codec")
+    settings = settings or get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    summary = TierSummary()
+    after: tuple[str, str] | None = None
+    while True:
+        batch = models.get_reports_older_than_batch(settings, cutoff, batch_size, after)
+        if not batch:
+            break
+        last = batch[-1]
+        after = (last.sort_key, last.report_id)
+        for record in batch:
+            scanner_file = record.metadata.get("scanner_file")
+            if not scanner_file:
+                continue
+            source = Path(scanner_file)
+            if source.suffix.lower() in COMPRESSED_SUFFIXES:
+                # Already tiered; drop an original left behind by an interrupted run.
+                remove_file(source.with_suffix(""))
+                continue
+            if not source.exists():
+                continue
+            target = source.with_name(source.name + CODEC_SUFFIXES[codec])
+            _compress(source, target, codec)
+            size_before = source.stat().st_size
+            size_after = target.stat().st_size
+            if not models.replace_report_path(
+                settings, record.report_id, "scanner_file", str(source), str(target), size_after - size_before
+            ):
+                remove_file(target)
+                continue
+            remove_file(source)
+            summary.files += 1
+            summary.bytes_before += size_before
+            summary.bytes_after += size_after
+    print(
+        f"Compressed {summary.files} uploads with {codec}: "
+        f"{summary.bytes_before} -> {summary.bytes_after} bytes."
+    )
+    return summary
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Compress aging scanner uploads.")
+    parser.add_argument("--days", type=int, default=settings.tier_after_days, help="compress uploads older than this")
+    parser.add_argument("--codec", choices=sorted(CODEC_SUFFIXES), default=settings.tier_codec)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    compress_aging_uploads(args.days, args.codec, args.batch_size, settings)
+
+
+if __name__ == "__main__":
+    main()
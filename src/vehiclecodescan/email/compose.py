@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+from ..utils.i18n import translate
+
+
+def compose_report_email(
+    report_id: str,
+    vin: str | None,
+    codes: Sequence[str],
+    language: str,
+    links: Mapping[str, str] | None = None,
+    link_ttl: int = 0,
+) -> tuple[str, str]:
+    """Return the localized ``(subject, body)`` for a report email.
+
+    With ``links`` (download URL per report language) the body says the report
+    is ready to download and lists them instead of referring to attachments.
+    """
+    subject = translate(
+        "email.subject",
+        language,
+        default="Vehicle diagnostic report for {vin}",
+        vin=vin or report_id,
+    )
+    detected = ", ".join(codes) or translate(
+        "report.diagnostics.no_codes",
+        language,
+        default="None",
+    )
+    if links:
+        body = translate(
+            "email.body_links",
+            language,
+            default=(
+                "Your vehicle's diagnostic report is ready to download.\n\n"
+                "Report ID: {report_id}\nDetected codes: {codes}"
+            ),
+            report_id=report_id,
+            codes=detected,
+        )
+        return subject, body + "\n\n" + download_links_text(links, language, link_ttl)
+    body = translate(
+        "email.body",
+        language,
+        default=(
+            "Attached is the diagnostic report for your vehicle. \n\n"
+            "Report ID: {report_id}\nDetected codes: {codes}"
+        ),
+        report_id=report_id,
+        codes=detected,
+    )
+    return subject, body
+
+
+def download_links_text(links: Mapping[str, str], language: str, link_ttl: int) -> str:
+    """Return the localized lines listing one download link per report language."""
+    lines = []
+    for lang, url in links.items():
+        line = translate(
+            "email.download_link",
+            language,
+            default="Download the report (link valid for {days} days): {url}",
+            days=max(1, link_ttl // 86400),
+            url=url,
+        )
+        lines.append(f"{lang.upper()}: {line}" if len(links) > 1 else line)
+    return "\n\n".join(lines)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from ..config import Settings, get_settings
+from ..storage import models
+from .send import build_report_message, send_messages
+
+# How long a claimed message stays reserved for one sender before others may retry it.
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+class OutboxSender:
+    """Drains the ``outbox`` table with bounded concurrency and exponential backoff.
+
+    Messages that keep failing are retried after ``base_delay * 2**attempt``
+    seconds (capped at ``max_delay``, with jitter) and moved to the ``dead``
+    status after ``max_attempts`` tries or when an attachment no longer exists.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.concurrency = max(settings.outbox_concurrency, 1)
+        self.max_attempts = max(settings.outbox_max_attempts, 1)
+        self.base_delay = settings.outbox_base_delay
+        self.max_delay = settings.outbox_max_delay
+        self.poll_interval = settings.outbox_poll_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** max(attempts - 1, 0)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _deliver(self, message: models.OutboxMessage) -> None:
+        mail_settings = self.settings.mail
+        try:
+            if mail_settings is None:
+                raise RuntimeError("Mail settings not configured")
+            email = build_report_message(
+                message.recipient,
+                message.subject,
+                message.body,
+                [Path(path) for path in message.attachments],
+                mail_settings,
+            )
+            send_messages([email], self.settings)
+        except FileNotFoundError as exc:
+            models.mark_email_failed(self.settings, message.message_id, f"Attachment missing: {exc}", None)
+        except Exception as exc:
+            attempts = message.attempts + 1
+            retry_at = None
+            if attempts < self.max_attempts:
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.backoff(attempts))
+            models.mark_email_failed(self.settings, message.message_id, f"{type(exc).__name__}: {exc}", retry_at)
+        else:
+            models.mark_email_sent(self.settings, message.message_id)
+
+    def drain_once(self) -> int:
+        """Send every message that is currently due; return how many were attempted."""
+        attempted = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                batch = models.claim_due_emails(
+                    self.settings, datetime.now(timezone.utc), self.concurrency, CLAIM_LEASE
+                )
+                if not batch:
+                    return attempted
+                list(executor.map(self._deliver, batch))
+                attempted += len(batch)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.drain_once()
+            except Exception as exc:  # pragma: no cover - keep the sender thread alive
+                print(f"Outbox sender error: {exc}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+_sender: OutboxSender | None = None
+_sender_pid: int | None = None
+_sender_lock = threading.Lock()
+
+
+def start_sender(settings: Settings) -> OutboxSender:
+    """Start this process's background sender unless it is already running.
+
+    Threads do not survive ``fork``, so the sender is started lazily in each
+    worker (on its first request) rather than in a preloading master process.
+    """
+    global _sender, _sender_pid
+    sender = _sender
+    if sender is not None and _sender_pid == os.getpid() and sender.is_running():
+        return sender
+    with _sender_lock:
+        if _sender is None or _sender_pid != os.getpid() or not _sender.is_running():
+            _sender = OutboxSender(settings)
+            _sender_pid = os.getpid()
+            _sender.start()
+        return _sender
+
+
+def ensure_sender(settings: Settings) -> OutboxSender:
+    """Start the background sender if needed and wake it to send new mail now."""
+    sender = start_sender(settings)
+    sender.wake()
+    return sender
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deliver queued report emails.")
+    parser.add_argument("--watch", action="store_true", help="keep polling instead of exiting once drained")
+    args = parser.parse_args()
+
+    sender = OutboxSender(get_settings())
+    if args.watch:
+        while True:
+            try:
+                sender.drain_once()
+            except Exception as exc:  # keep watching through transient DB or SMTP errors
+                print(f"Outbox sender error: {exc}", file=sys.stderr)
+            time.sleep(sender.poll_interval)
+    attempted = sender.drain_once()
+    dead = len(models.list_outbox(sender.settings, models.OUTBOX_DEAD))
+    print(f"Attempted {attempted} queued emails; {dead} in dead letters.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from ..config import MailSettings
+
+SMTP_TIMEOUT = 30
+
+# Errors that mean the session is unusable and must not go back into the pool.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+
+class SMTPPool:
+    """Keeps authenticated SMTP sessions alive between sends.
+
+    Idle sessions are health-checked with ``NOOP`` before reuse and dropped once
+    they have been idle longer than ``idle_timeout``. At most ``max_size``
+    sessions are open at once; further callers wait for one to be returned.
+    """
+
+    def __init__(
+        self,
+        settings: MailSettings,
+        max_size: int = 4,
+        idle_timeout: float = 60.0,
+        factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.settings = settings
+        self.idle_timeout = idle_timeout
+        self._factory = factory
+        self._clock = clock
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(max_size, 1))
+
+    def _open(self) -> smtplib.SMTP:
+        server = self._factory(self.settings.server, self.settings.port, timeout=SMTP_TIMEOUT)
+        try:
+            if self.settings.use_tls:
+                server.starttls()
+            if self.settings.username:
+                server.login(self.settings.username, self.settings.password)
+        except BaseException:
+            _close_quietly(server)
+            raise
+        return server
+
+    def _is_alive(self, server: smtplib.SMTP) -> bool:
+        try:
+            code, _ = server.noop()
+        except CONNECTION_ERRORS + (smtplib.SMTPException,):
+            return False
+        return code == 250
+
+    def _checkout(self) -> tuple[smtplib.SMTP, bool]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if self._clock() - last_used <= self.idle_timeout and self._is_alive(server):
+                return server, True
+            _close_quietly(server)
+        return self._open(), False
+
+    @contextmanager
+    def connection(self) -> Iterator[tuple[smtplib.SMTP, bool]]:
+        """Yield ``(server, reused)``; the session is returned to the pool on success."""
+        self._slots.acquire()
+        try:
+            server, reused = self._checkout()
+            try:
+                yield server, reused
+            except CONNECTION_ERRORS:
+                _close_quietly(server)
+                raise
+            except smtplib.SMTPException:
+                # Protocol-level failure on an otherwise healthy session; reset it
+                # so the next message starts a clean transaction.
+                try:
+                    server.rset()
+                except CONNECTION_ERRORS + (smtplib.SMTPException,):
+                    _close_quietly(server)
+                    raise
+                self._release(server)
+                raise
+            except BaseException:
+                _close_quietly(server)
+                raise
+            else:
+                self._release(server)
+        finally:
+            self._slots.release()
+
+    def _release(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append((server, self._clock()))
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            _close_quietly(server)
+
+
+def _close_quietly(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except CONNECTION_ERRORS + (smtplib.SMTPException,):
+        server.close()
+
+
+_POOLS: dict[tuple[str, int, str, bool], SMTPPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(settings: MailSettings) -> SMTPPool:
+    key = (settings.server, settings.port, settings.username, settings.use_tls)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = SMTPPool(settings, max_size=settings.pool_size, idle_timeout=settings.pool_idle_timeout)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _forget_inherited_pools() -> None:
+    # Sockets inherited from the parent must never be shared with a forked child.
+    global _POOLS_LOCK
+    _POOLS.clear()
+    _POOLS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_pools)
@@ -1,58 +1,67 @@
 from __future__ import annotations
 
-import smtplib
 from email.message import EmailMessage
 from pathlib import Path
-from typing import Any
+from typing import Sequence
 
 from ..config import MailSettings, Settings
+from .pool import CONNECTION_ERRORS, get_pool
 
 
-def send_report(recipient: str, subject: str, body: str, pdf_path: Path, settings: Settings) -> bool:
-    mail_settings = settings.mail
-    if mail_settings is None:
-        print("Mail settings not configured; skipping email send.")
-        return False
-
+def build_report_message(
+    recipient: str, subject: str, body: str, attachments: Sequence[Path], mail_settings: MailSettings
+) -> EmailMessage:
     message = EmailMessage()
     message["Subject"] = subject
     message["From"] = mail_settings.sender
     message["To"] = recipient
     message.set_content(body)
 
-    with pdf_path.open("rb") as handle:
-        message.add_attachment(
-            handle.read(),
-            maintype="application",
-            subtype="pdf",
-            filename=pdf_path.name,
-        )
-
-    with _connect(mail_settings) as server:
-        if mail_settings.use_tls:
-            server.starttls()
-        if mail_settings.username:
-            server.login(mail_settings.username, mail_settings.password)
-        server.send_message(message)
-    return True
+    for pdf_path in attachments:
+        with pdf_path.open("rb") as handle:
+            message.add_attachment(
+                handle.read(),
+                maintype="application",
+                subtype="pdf",
+                filename=pdf_path.name,
+            )
+    return message
 
 
-class _SMTPConnection:
-    def __init__(self, settings: MailSettings):
-        self.settings = settings
-        self.server: smtplib.SMTP | None = None
+def send_report(recipient: str, subject: str, body: str, pdf_path: Path, settings: Settings) -> bool:
+    mail_settings = settings.mail
+    if mail_settings is None:
+        print("Mail settings not configured; skipping email send.")
+        return False
+
+    message = build_report_message(recipient, subject, body, [pdf_path], mail_settings)
+    send_messages([message], settings)
+    return True
 
-    def __enter__(self) -> smtplib.SMTP:
-        self.server = smtplib.SMTP(self.settings.server, self.settings.port, timeout=30)
-        return self.server
 
-    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
-        if self.server is not None:
-            try:
-                self.server.quit()
-            except smtplib.SMTPException:
-                self.server.close()
+def send_messages(messages: Sequence[EmailMessage], settings: Settings) -> int:
+    """Send ``messages`` over a single pooled session and return how many were sent.
 
+    A reused session that turns out to be dead mid-batch is replaced once and the
+    remaining messages are retried on a fresh connection.
+    """
+    mail_settings = settings.mail
+    if mail_settings is None:
+        print("Mail settings not configured; skipping email send.")
+        return 0
 
-def _connect(settings: MailSettings) -> _SMTPConnection:
-    return _SMTPConnection(settings)
+    pool = get_pool(mail_settings)
+    sent = 0
+    retried = False
+    while sent < len(messages):
+        reused = False
+        try:
+            with pool.connection() as (server, reused):
+                for message in messages[sent:]:
+                    server.send_message(message)
+                    sent += 1
+        except CONNECTION_ERRORS:
+            if retried or not reused:
+                raise
+            retried = True
+    return sent
@@ -0,0 +1,170 @@
+"""A minimal in-process SMTP server for tests and load runs.
+
+It speaks just enough SMTP for :mod:`smtplib` (EHLO, AUTH PLAIN/LOGIN, MAIL,
+RCPT, DATA, NOOP, RSET, QUIT), accepts any credentials and keeps every
+delivered message in memory. STARTTLS is not offered, so point it at
+``MailSettings(use_tls=False)``.
+"""
+from __future__ import annotations
+
+import re
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from typing import Any
+
+_ADDRESS_PATTERN = re.compile(r"<([^>]*)>")
+
+
+@dataclass
+class ReceivedMessage:
+    sender: str
+    recipients: list[str]
+    data: bytes
+
+    def parsed(self) -> EmailMessage:
+        return message_from_bytes(self.data, policy=policy.default)  # type: ignore[return-value]
+
+
+@dataclass
+class _ServerStats:
+    connections: int = 0
+    logins: int = 0
+    noops: int = 0
+    messages: list[ReceivedMessage] = field(default_factory=list)
+
+
+def _address(argument: str) -> str:
+    match = _ADDRESS_PATTERN.search(argument)
+    return match.group(1) if match else argument.partition(":")[2].strip()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: "_ThreadingSMTPServer"
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+        self.wfile.flush()
+
+    def _readline(self) -> str | None:
+        raw = self.rfile.readline()
+        if not raw:
+            return None
+        return raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def handle(self) -> None:
+        owner = self.server.owner
+        with owner.lock:
+            owner.stats.connections += 1
+        self._reply("220 localhost stand-in ESMTP")
+        sender = ""
+        recipients: list[str] = []
+        while True:
+            line = self._readline()
+            if line is None:
+                return
+            verb, _, argument = line.partition(" ")
+            verb = verb.upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                self.wfile.flush()
+            elif verb == "HELO":
+                self._reply("250 localhost")
+            elif verb == "AUTH":
+                mechanism, _, initial = argument.partition(" ")
+                if mechanism.upper() == "LOGIN":
+                    for prompt in ("334 VXNlcm5hbWU6", "334 UGFzc3dvcmQ6"):
+                        self._reply(prompt)
+                        if self._readline() is None:
+                            return
+                elif not initial:
+                    self._reply("334 ")
+                    if self._readline() is None:
+                        return
+                with owner.lock:
+                    owner.stats.logins += 1
+                self._reply("235 Authentication successful")
+            elif verb == "MAIL":
+                sender = _address(argument)
+                recipients = []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(_address(argument))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                chunks: list[bytes] = []
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw:
+                        return
+                    if raw in (b".\r\n", b".\n"):
+                        break
+                    if raw.startswith(b".."):
+                        raw = raw[1:]
+                    chunks.append(raw)
+                with owner.lock:
+                    owner.stats.messages.append(ReceivedMessage(sender, recipients, b"".join(chunks)))
+                sender, recipients = "", []
+                self._reply("250 OK queued")
+            elif verb == "NOOP":
+                with owner.lock:
+                    owner.stats.noops += 1
+                self._reply("250 OK")
+            elif verb == "RSET":
+                sender, recipients = "", []
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, owner: "LocalSMTPServer", address: tuple[str, int]):
+        self.owner = owner
+        super().__init__(address, _SMTPHandler)
+
+
+class LocalSMTPServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.lock = threading.Lock()
+        self.stats = _ServerStats()
+        self._server = _ThreadingSMTPServer(self, (host, port))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def messages(self) -> list[ReceivedMessage]:
+        with self.lock:
+            return list(self.stats.messages)
+
+    def start(self) -> "LocalSMTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-smtp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List
 
+from ..utils.files import logical_suffix, open_text
+
 CODE_PATTERN = re.compile(r"\b([PCBU][0-9A-F]{4})\b", re.IGNORECASE)
 STATUS_KEYWORDS = {
     "pending": "pending",
@@ -24,7 +26,7 @@ class RawDiagnosticEntry:
 
 
 def parse_foxwell_output(path: Path) -> List[RawDiagnosticEntry]:
-    suffix = path.suffix.lower()
+    suffix = logical_suffix(path)
     if suffix == ".csv":
         return _parse_csv(path)
     return _parse_text(path)
@@ -32,7 +34,7 @@ def parse_foxwell_output(path: Path) -> List[RawDiagnosticEntry]:
 
 def _parse_csv(path: Path) -> List[RawDiagnosticEntry]:
     entries: List[RawDiagnosticEntry] = []
-    with path.open("r", encoding="utf-8-sig", newline="") as handle:
+    with open_text(path, encoding="utf-8-sig", newline="") as handle:
         reader = csv.DictReader(handle)
         code_field = _find_code_field(reader.fieldnames or [])
         for row in reader:
@@ -89,7 +91,7 @@ def _normalize_code(value: str | None) -> str | None:
 
 def _parse_text(path: Path) -> List[RawDiagnosticEntry]:
     entries: List[RawDiagnosticEntry] = []
-    with path.open("r", encoding="utf-8-sig", errors="ignore") as handle:
+    with open_text(path, encoding="utf-8-sig", errors="ignore") as handle:
         for line in handle:
             matches = CODE_PATTERN.findall(line)
             if not matches:
@@ -21,6 +21,13 @@ for _candidate in _DATA_SEARCH:
 else:  # pragma: no cover - fallback for unusual setups
     DATA_PATH = _MODULE_PATH.parent / "obd_codes.json"
 
+# Manufacturer-specific codes live in one shard per make, chosen from the VIN's
+# world manufacturer identifier (WMI) through ``wmi.json``.
+WMI_PATH = DATA_PATH.parent / "wmi.json"
+MANUFACTURER_DIR = DATA_PATH.parent / "manufacturers"
+# Shards kept in memory per process; the least recently used is dropped first.
+MANUFACTURER_CACHE_SIZE = 8
+
 
 @dataclass
 class InterpretedCode:
@@ -41,11 +48,48 @@ def _load_database() -> dict[str, dict]:
         return json.load(handle)
 
 
-def interpret_codes(entries: Iterable[RawDiagnosticEntry], language: str) -> List[InterpretedCode]:
+@lru_cache(maxsize=1)
+def _load_wmi_table() -> dict[str, str]:
+    if not WMI_PATH.exists():
+        return {}
+    with WMI_PATH.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+@lru_cache(maxsize=MANUFACTURER_CACHE_SIZE)
+def _load_manufacturer_shard(manufacturer: str) -> dict[str, dict]:
+    path = MANUFACTURER_DIR / f"{manufacturer}.json"
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def manufacturer_for_vin(vin: str | None) -> str | None:
+    """Return the code shard for a VIN's WMI (first three characters), if any."""
+    if not vin:
+        return None
+    wmi = vin.strip().upper()[:3]
+    table = _load_wmi_table()
+    # Some makers are identified by the first two characters alone.
+    return table.get(wmi) or table.get(wmi[:2])
+
+
+def preload_code_database() -> None:
+    # Manufacturer shards are left to load on first use in each worker.
+    _load_database()
+    _load_wmi_table()
+
+
+def interpret_codes(
+    entries: Iterable[RawDiagnosticEntry], language: str, vin: str | None = None
+) -> List[InterpretedCode]:
     database = _load_database()
+    manufacturer = manufacturer_for_vin(vin)
+    shard = _load_manufacturer_shard(manufacturer) if manufacturer else {}
     results: List[InterpretedCode] = []
     for entry in entries:
-        record = database.get(entry.code.upper())
+        record = shard.get(entry.code.upper()) or database.get(entry.code.upper())
         if record:
             description = _get_localized(record.get("description", {}), language)
             advice = _get_localized(record.get("advice", {}), language)
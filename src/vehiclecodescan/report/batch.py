@@ -0,0 +1,285 @@
+"""Generate reports offline from a zip or directory of submissions.
+
+The input holds the scanner exports and photos plus a JSON manifest (by
+default ``manifest.json`` at its root) listing one submission per entry::
+
+    [
+      {"scanner_file": "van12/scan.csv", "images": ["van12/front.jpg"],
+       "email": "owner@example.com", "vin": "1HGCM82633A123456",
+       "mileage": "84,000", "notes": "Rough idle", "languages": ["en", "es"]}
+    ]
+
+Paths are relative to the input root. ``language`` may be given instead of
+``languages``; the first language names ``{report_id}.pdf`` and the others
+``{report_id}_{language}.pdf``. Each submission is parsed, interpreted
+and rendered in a process pool, then registered in the metadata DB exactly like
+a web upload; with ``--send-email`` its email is queued in the outbox.
+
+    python -m vehiclecodescan.report.batch day.zip --send-email
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from ..config import Settings, get_settings
+from ..email.compose import compose_report_email
+from ..parser.foxwell import parse_foxwell_output
+from ..parser.interpret import interpret_codes, preload_code_database
+from ..storage import models
+from ..utils.files import ensure_directory, image_within_limits, inspect_jpeg_file, is_allowed_image
+from ..utils.i18n import DEFAULT_LANGUAGE, available_languages, preload_catalogs
+from ..utils.tokens import make_download_token
+from .generator import ReportContext, VehicleInfo, generate_report, preload_report_assets, report_pdf_name
+
+DEFAULT_MANIFEST = "manifest.json"
+
+
+@dataclass
+class BatchJob:
+    report_id: str
+    created_at: datetime
+    scanner_path: Path
+    image_paths: list[Path]
+    image_sizes: list[tuple[int, int]]
+    email: str | None
+    languages: list[str]
+    vehicle: VehicleInfo
+
+
+@dataclass
+class BatchResult:
+    report_id: str
+    pdf_paths: dict[str, Path]
+    codes: list[dict[str, Any]] = field(default_factory=list)
+
+
+def load_manifest(root: Path, manifest: Path | None = None) -> list[dict[str, Any]]:
+    path = manifest or root / DEFAULT_MANIFEST
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get("submissions", [])
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of submissions")
+    return data
+
+
+def _resolve(root: Path, relative: str) -> Path:
+    path = (root / relative).resolve()
+    if root.resolve() not in path.parents:
+        raise ValueError(f"{relative}: path escapes the submission root")
+    if not path.is_file():
+        raise FileNotFoundError(relative)
+    return path
+
+
+def prepare_job(entry: dict[str, Any], root: Path, settings: Settings, languages: list[str]) -> BatchJob:
+    """Validate a manifest entry and copy its files into the upload directory."""
+    scanner_source = _resolve(root, entry["scanner_file"])
+    image_sources = [_resolve(root, image) for image in entry.get("images", [])]
+    invalid = [path.name for path in image_sources if not is_allowed_image(path.name)]
+    if invalid:
+        raise ValueError(f"Only JPG images are supported ({', '.join(invalid)})")
+    image_sizes = []
+    for path in image_sources:
+        info = inspect_jpeg_file(path)
+        if info is None:
+            raise ValueError(f"{path.name} is not a valid JPEG image")
+        if not image_within_limits(info, settings.max_image_pixels, settings.max_image_dimension):
+            raise ValueError(f"{path.name} is too large ({info.width}x{info.height})")
+        image_sizes.append((info.width, info.height))
+    requested = entry.get("languages") or [entry.get("language") or DEFAULT_LANGUAGE]
+    chosen = [language for language in dict.fromkeys(requested) if language in languages] or [DEFAULT_LANGUAGE]
+
+    report_id = uuid.uuid4().hex
+    ensure_directory(settings.upload_dir)
+    scanner_path = settings.upload_dir / f"{report_id}_scanner{scanner_source.suffix or '.bin'}"
+    shutil.copyfile(scanner_source, scanner_path)
+    image_paths = []
+    for index, source in enumerate(image_sources):
+        target = settings.upload_dir / f"{report_id}_image{index}{source.suffix.lower()}"
+        shutil.copyfile(source, target)
+        image_paths.append(target)
+
+    return BatchJob(
+        report_id=report_id,
+        created_at=datetime.now(timezone.utc),
+        scanner_path=scanner_path,
+        image_paths=image_paths,
+        image_sizes=image_sizes,
+        email=(entry.get("email") or "").strip() or None,
+        languages=chosen,
+        vehicle=VehicleInfo(
+            vin=entry.get("vin") or None,
+            mileage=entry.get("mileage") or None,
+            notes=entry.get("notes") or None,
+        ),
+    )
+
+
+def _init_worker() -> None:
+    preload_code_database()
+    preload_catalogs()
+    preload_report_assets()
+
+
+def render_job(job: BatchJob, settings: Settings) -> BatchResult:
+    """Parse once, then interpret and render each language. Runs in a pool worker."""
+    entries = parse_foxwell_output(job.scanner_path)
+    pdf_paths: dict[str, Path] = {}
+    codes: list[dict[str, Any]] = []
+    for index, language in enumerate(job.languages):
+        interpreted = interpret_codes(entries, language, job.vehicle.vin)
+        context = ReportContext(
+            report_id=job.report_id,
+            created_at=job.created_at,
+            language=language,
+            vehicle=job.vehicle,
+            codes=interpreted,
+            images=job.image_paths,
+            image_sizes=job.image_sizes,
+        )
+        filename = report_pdf_name(job.report_id, language if index else None)
+        pdf_paths[language] = generate_report(context, settings, filename)
+        if not index:
+            codes = [asdict(code) for code in interpreted]
+    return BatchResult(report_id=job.report_id, pdf_paths=pdf_paths, codes=codes)
+
+
+def register_result(job: BatchJob, result: BatchResult, settings: Settings, send_email: bool) -> bool:
+    language = job.languages[0]
+    attachments = [str(path) for path in result.pdf_paths.values()]
+    metadata = {
+        "created_at": job.created_at,
+        "scanner_file": str(job.scanner_path),
+        "image_paths": [str(path) for path in job.image_paths],
+        "pdf_path": str(result.pdf_paths[language]),
+        "pdf_paths": dict(zip(result.pdf_paths, attachments)),
+        "email": job.email or "",
+        "language": language,
+        "languages": job.languages,
+        "vehicle": asdict(job.vehicle),
+        "codes": result.codes,
+        "source": "batch",
+    }
+    models.store_report(settings, job.report_id, metadata)
+    if not (send_email and job.email and settings.mail is not None):
+        return False
+    codes = [code["code"] for code in result.codes]
+    links: dict[str, str] | None = None
+    if sum(path.stat().st_size for path in result.pdf_paths.values()) > settings.mail.attachment_limit:
+        # Too large to attach. Without a request the links need APP_EXTERNAL_URL.
+        if not settings.external_url:
+            print(
+                f"[warn] {job.report_id}: reports exceed MAIL_ATTACHMENT_LIMIT and APP_EXTERNAL_URL "
+                "is not set; email not queued",
+                file=sys.stderr,
+            )
+            return False
+        token = make_download_token(settings.secret_key, job.report_id)
+        base = f"{settings.external_url.rstrip('/')}/reports/{job.report_id}.pdf"
+        links = {}
+        for lang in result.pdf_paths:
+            params = {"token": token} if lang == language else {"lang": lang, "token": token}
+            links[lang] = f"{base}?{urlencode(params)}"
+        attachments = []
+    subject, body = compose_report_email(
+        job.report_id, job.vehicle.vin, codes, language, links=links, link_ttl=settings.download_link_ttl
+    )
+    models.enqueue_email(settings, job.report_id, job.email, subject, body, attachments)
+    return True
+
+
+def _discard(job: BatchJob) -> None:
+    for path in [job.scanner_path, *job.image_paths]:
+        path.unlink(missing_ok=True)
+
+
+def run_batch(
+    source: Path,
+    manifest: Path | None = None,
+    workers: int | None = None,
+    send_email: bool = False,
+    settings: Settings | None = None,
+) -> tuple[int, int]:
+    """Process every submission in ``source``; return ``(succeeded, failed)``."""
+    settings = settings or get_settings()
+    with tempfile.TemporaryDirectory(prefix="vcs-batch-") as scratch:
+        if zipfile.is_zipfile(source):
+            root = Path(scratch)
+            with zipfile.ZipFile(source) as archive:
+                archive.extractall(root)
+        else:
+            root = source
+        entries = load_manifest(root, manifest)
+        languages = available_languages() or [DEFAULT_LANGUAGE]
+
+        jobs: list[BatchJob] = []
+        failed = 0
+        for index, entry in enumerate(entries):
+            try:
+                jobs.append(prepare_job(entry, root, settings, languages))
+            except (KeyError, OSError, ValueError) as exc:
+                failed += 1
+                print(f"[skip] submission {index}: {exc!r}", file=sys.stderr)
+
+        total = len(jobs)
+        succeeded = 0
+        queued = 0
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker) as executor:
+            futures = {executor.submit(render_job, job, settings): job for job in jobs}
+            for done, future in enumerate(as_completed(futures), start=1):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    failed += 1
+                    _discard(job)
+                    print(f"[{done}/{total}] {job.report_id} failed: {exc!r}", file=sys.stderr)
+                    continue
+                queued += register_result(job, result, settings, send_email)
+                succeeded += 1
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[{done}/{total}] {job.report_id} ok ({done / elapsed:.1f} reports/s)",
+                    file=sys.stderr,
+                )
+        elapsed = time.perf_counter() - started
+
+    rate = succeeded / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Generated {succeeded} reports in {elapsed:.1f}s ({rate:.2f} reports/s); "
+        f"{failed} failed, {queued} emails queued."
+    )
+    return succeeded, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate reports from a zip or directory of submissions.")
+    parser.add_argument("source", type=Path, help="zip file or directory containing the submissions")
+    parser.add_argument("--manifest", type=Path, default=None, help=f"defaults to <source>/{DEFAULT_MANIFEST}")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--send-email", action="store_true", help="queue each report's email in the outbox")
+    args = parser.parse_args()
+    _, failed = run_batch(args.source, args.manifest, args.workers, args.send_email)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Sequence
+from typing import NamedTuple, Sequence
 from xml.sax.saxutils import escape
 
 from reportlab.lib import colors
@@ -14,7 +16,15 @@ from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Tabl
 
 from ..config import Settings
 from ..parser.interpret import InterpretedCode
-from ..utils.i18n import translate
+from ..utils.i18n import translate, translate_many
+
+_DIAGNOSTIC_COLUMNS = {
+    "report.diagnostics.code": "Code",
+    "report.diagnostics.status": "Status",
+    "report.diagnostics.severity": "Severity",
+    "report.diagnostics.description": "Description",
+    "report.diagnostics.recommendation": "Recommendation",
+}
 
 
 @dataclass
@@ -32,14 +42,58 @@ class ReportContext:
     vehicle: VehicleInfo
     codes: Sequence[InterpretedCode]
     images: Sequence[Path]
+    # (width, height) in pixels for each entry of ``images`` when already known
+    # from upload validation; lets the renderer skip re-reading the headers.
+    image_sizes: Sequence[tuple[int, int]] = ()
 
 
-def generate_report(context: ReportContext, settings: Settings) -> Path:
-    pdf_path = settings.report_dir / f"{context.report_id}.pdf"
-    doc = SimpleDocTemplate(str(pdf_path), pagesize=letter, topMargin=36, bottomMargin=36)
+class _KnownSizeJpeg(Image):
+    """A JPEG flowable built from known pixel dimensions.
+
+    ``Image.__init__`` opens every JPEG to read its size; this mirrors its
+    JPEG branch with the size supplied instead.
+    """
+
+    def __init__(self, filename: str, width: int, height: int, draw_width: float, draw_height: float):
+        self.hAlign = "CENTER"
+        self._mask = "auto"
+        self._drawing = None
+        self._file = self.filename = filename
+        self._dpi = False
+        self._img = None
+        self.imageWidth = width
+        self.imageHeight = height
+        self._setup(draw_width, draw_height, "direct", 0)
+
+
+_MAX_IMAGE_WIDTH = 6.5 * inch
+
+
+def _report_image(path: Path, size: tuple[int, int] | None) -> Image:
+    if size is None:
+        img = Image(str(path))
+        if img.drawWidth > _MAX_IMAGE_WIDTH:
+            scale = _MAX_IMAGE_WIDTH / img.drawWidth
+            img.drawWidth *= scale
+            img.drawHeight *= scale
+        return img
+    width, height = size
+    scale = min(1.0, _MAX_IMAGE_WIDTH / width)
+    return _KnownSizeJpeg(str(path), width, height, width * scale, height * scale)
+
+
+class _ReportStyles(NamedTuple):
+    heading: ParagraphStyle
+    subheading: ParagraphStyle
+    normal: ParagraphStyle
+    disclaimer: ParagraphStyle
+
+
+@lru_cache(maxsize=1)
+def _report_styles() -> _ReportStyles:
+    # Styles are only read while building, so a single instance is shared by
+    # every report rendered in this process.
     styles = getSampleStyleSheet()
-    heading = styles["Heading1"]
-    subheading = styles["Heading2"]
     normal = styles["BodyText"]
     normal.spaceAfter = 12
     disclaimer_style = ParagraphStyle(
@@ -49,6 +103,42 @@ def generate_report(context: ReportContext, settings: Settings) -> Path:
         leading=10,
         textColor=colors.HexColor("#555555"),
     )
+    return _ReportStyles(
+        heading=styles["Heading1"],
+        subheading=styles["Heading2"],
+        normal=normal,
+        disclaimer=disclaimer_style,
+    )
+
+
+def preload_report_assets() -> None:
+    """Build styles and render a throwaway document to load fonts and lazy ReportLab modules."""
+    styles = _report_styles()
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=letter)
+    doc.build(
+        [
+            Paragraph("warm-up", styles.heading),
+            Paragraph("warm-up", styles.subheading),
+            Table([["warm-up"]]),
+            Paragraph("warm-up", styles.normal),
+            Paragraph("warm-up", styles.disclaimer),
+        ]
+    )
+
+
+def report_pdf_name(report_id: str, language: str | None = None) -> str:
+    """``{report_id}.pdf`` for a report's first language, ``{report_id}_{language}.pdf`` for the others."""
+    return f"{report_id}_{language}.pdf" if language else f"{report_id}.pdf"
+
+
+def generate_report(context: ReportContext, settings: Settings, filename: str | None = None) -> Path:
+    pdf_path = settings.report_dir / (filename or report_pdf_name(context.report_id))
+    doc = SimpleDocTemplate(str(pdf_path), pagesize=letter, topMargin=36, bottomMargin=36)
+    styles = _report_styles()
+    heading = styles.heading
+    subheading = styles.subheading
+    normal = styles.normal
+    disclaimer_style = styles.disclaimer
 
     lang = context.language
     story = []
@@ -100,15 +190,7 @@ def generate_report(context: ReportContext, settings: Settings) -> Path:
     story.append(Paragraph(translate("report.diagnostics.heading", lang, default="Diagnostics"), subheading))
 
     if context.codes:
-        data = [
-            [
-                translate("report.diagnostics.code", lang, default="Code"),
-                translate("report.diagnostics.status", lang, default="Status"),
-                translate("report.diagnostics.severity", lang, default="Severity"),
-                translate("report.diagnostics.description", lang, default="Description"),
-                translate("report.diagnostics.recommendation", lang, default="Recommendation"),
-            ]
-        ]
+        data = [translate_many(_DIAGNOSTIC_COLUMNS, lang, defaults=_DIAGNOSTIC_COLUMNS)]
         for code in context.codes:
             data.append([
                 code.code,
@@ -141,14 +223,9 @@ def generate_report(context: ReportContext, settings: Settings) -> Path:
 
     if context.images:
         story.append(Paragraph(translate("report.images.heading", lang, default="Images"), subheading))
-        for image_path in context.images:
-            img = Image(str(image_path))
-            max_width = 6.5 * inch
-            if img.drawWidth > max_width:
-                scale = max_width / img.drawWidth
-                img.drawWidth *= scale
-                img.drawHeight *= scale
-            story.append(img)
+        for index, image_path in enumerate(context.images):
+            size = context.image_sizes[index] if index < len(context.image_sizes) else None
+            story.append(_report_image(image_path, size))
             story.append(Spacer(1, 6))
 
     disclaimer_title = translate("report.disclaimer.title", lang, default="Disclaimer")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Sequence
+
+from ..config import Settings
+from ..utils.i18n import preload_catalogs
+from .generator import ReportContext, generate_report, preload_report_assets, report_pdf_name
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _init_worker() -> None:
+    preload_catalogs()
+    preload_report_assets()
+
+
+def _render_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # Forking a threaded web worker can copy held locks into the child,
+            # so pool processes come from a clean forkserver (or spawn) parent.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker)
+        return _POOL
+
+
+def shutdown_render_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def render_reports(contexts: Sequence[ReportContext], settings: Settings, inline: bool = False) -> list[Path]:
+    """Render one PDF per context, one context per language of the same report.
+
+    The first context is written to ``{report_id}.pdf`` and rendered in the
+    calling thread while the others, named ``{report_id}_{language}.pdf``, are
+    rendered concurrently in this process's render pool. With
+    ``render_processes`` set to 0, or ``inline`` (used while profiling, as a
+    profiler only sees its own thread), every PDF is rendered in the calling
+    thread.
+    """
+    if not contexts:
+        return []
+    primary, extra = contexts[0], contexts[1:]
+    names = [report_pdf_name(context.report_id, context.language) for context in extra]
+    if extra and settings.render_processes > 0 and not inline:
+        try:
+            pool = _render_pool(settings.render_processes)
+            futures = [pool.submit(generate_report, context, settings, name) for context, name in zip(extra, names)]
+            primary_path = generate_report(primary, settings)
+            return [primary_path] + [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory): start a fresh pool
+            # next time and finish this report in the calling thread.
+            shutdown_render_pool()
+    return [generate_report(primary, settings)] + [
+        generate_report(context, settings, name) for context, name in zip(extra, names)
+    ]
+
+
+def _forget_inherited_pool() -> None:
+    # The parent's pool processes and their pipes belong to the parent.
+    global _POOL, _POOL_LOCK
+    _POOL = None
+    _POOL_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_pool)
@@ -3,20 +3,65 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable, List
+from typing import Any, Iterable, Iterator, List
 
 from ..config import Settings
 
 DB_FILENAME = "metadata.db"
 
 
+OUTBOX_PENDING = "pending"
+OUTBOX_SENDING = "sending"
+OUTBOX_SENT = "sent"
+OUTBOX_DEAD = "dead"
+
+# Broader searches skip BM25 ranking and list the newest matches instead.
+SEARCH_RANK_LIMIT = 1000
+EVICTION_ORDER = {
+    "oldest": "created_at",
+    "lru": "last_accessed",
+}
+
+
 @dataclass
 class ReportRecord:
     report_id: str
     created_at: datetime
     metadata: dict[str, Any]
+    # The ``created_at`` column exactly as stored; paging cursors must use it
+    # because a re-serialised datetime need not sort the same way.
+    sort_key: str = ""
+
+
+@dataclass
+class SearchHit:
+    report_id: str
+    created_at: datetime
+    metadata: dict[str, Any]
+    rank: float
+
+
+@dataclass
+class EvictionCandidate:
+    report_id: str
+    sort_key: str
+    total_bytes: int
+    metadata: dict[str, Any]
+
+
+@dataclass
+class OutboxMessage:
+    message_id: int
+    report_id: str | None
+    recipient: str
+    subject: str
+    body: str
+    attachments: list[str]
+    status: str
+    attempts: int
+    last_error: str | None
 
 
 def _db_path(settings: Settings) -> Path:
@@ -29,22 +74,145 @@ def _connect(settings: Settings) -> sqlite3.Connection:
     return sqlite3.connect(path)
 
 
+def report_file_paths(metadata: dict[str, Any]) -> list[Path]:
+    paths: list[Path] = []
+    scanner_path = metadata.get("scanner_file")
+    if scanner_path:
+        paths.append(Path(scanner_path))
+    pdf_path = metadata.get("pdf_path")
+    if pdf_path:
+        paths.append(Path(pdf_path))
+    for language_pdf in (metadata.get("pdf_paths") or {}).values():
+        if language_pdf and language_pdf != pdf_path:
+            paths.append(Path(language_pdf))
+    for image_path in metadata.get("image_paths", []):
+        paths.append(Path(image_path))
+    return paths
+
+
+def _files_size(paths: Iterable[Path]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+_REPORTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS reports (
+        id INTEGER PRIMARY KEY,
+        report_id TEXT NOT NULL UNIQUE,
+        created_at TEXT NOT NULL,
+        metadata TEXT NOT NULL,
+        total_bytes INTEGER NOT NULL DEFAULT 0,
+        last_accessed TEXT
+    )
+"""
+
+
+def _migrate_reports(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(reports)")}
+    if "total_bytes" not in columns:
+        conn.execute("ALTER TABLE reports ADD COLUMN total_bytes INTEGER NOT NULL DEFAULT 0")
+        # One-off backfill for rows stored before sizes were tracked.
+        sizes = [
+            (_files_size(report_file_paths(json.loads(metadata_json))), report_id)
+            for report_id, metadata_json in conn.execute("SELECT report_id, metadata FROM reports")
+        ]
+        conn.executemany("UPDATE reports SET total_bytes = ? WHERE report_id = ?", sizes)
+    if "last_accessed" not in columns:
+        conn.execute("ALTER TABLE reports ADD COLUMN last_accessed TEXT")
+        conn.execute("UPDATE reports SET last_accessed = created_at")
+    if "id" not in columns:
+        # The search index is keyed on ``reports.id``. Older tables only had
+        # the implicit rowid, which VACUUM may renumber, so copy the rows into
+        # a table with an explicit key and rebuild the index against it.
+        conn.execute("ALTER TABLE reports RENAME TO reports_old")
+        conn.execute(_REPORTS_TABLE)
+        conn.execute(
+            "INSERT INTO reports (report_id, created_at, metadata, total_bytes, last_accessed) "
+            "SELECT report_id, created_at, metadata, total_bytes, last_accessed FROM reports_old"
+        )
+        conn.execute("DROP TABLE reports_old")
+        conn.execute("DROP TABLE IF EXISTS reports_fts")
+
+
+def search_fields(metadata: dict[str, Any]) -> tuple[str, str, str, str]:
+    """Return the ``(vin, email, notes, codes)`` text indexed for a report."""
+    vehicle = metadata.get("vehicle") or {}
+    codes = " ".join(
+        f"{code.get('code', '')} {code.get('description', '')}" for code in metadata.get("codes", [])
+    )
+    return (vehicle.get("vin") or "", metadata.get("email") or "", vehicle.get("notes") or "", codes)
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'reports_fts'").fetchone()
+    if exists:
+        return
+    # The trigram tokenizer (SQLite 3.34+) matches any substring of three or
+    # more characters, which is what partial VIN and email lookups need.
+    try:
+        conn.execute("CREATE VIRTUAL TABLE reports_fts USING fts5(vin, email, notes, codes, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        conn.execute("CREATE VIRTUAL TABLE reports_fts USING fts5(vin, email, notes, codes)")
+    rows = conn.execute("SELECT id, metadata FROM reports").fetchall()
+    conn.executemany(
+        "INSERT INTO reports_fts (rowid, vin, email, notes, codes) VALUES (?, ?, ?, ?, ?)",
+        [(row_id, *search_fields(json.loads(metadata_json))) for row_id, metadata_json in rows],
+    )
+
+
+_INITIALIZED: set[Path] = set()
+
+
 def init_db(settings: Settings) -> None:
+    path = _db_path(settings)
+    if path in _INITIALIZED and path.exists():
+        return
     with _connect(settings) as conn:
+        conn.execute(_REPORTS_TABLE)
+        _migrate_reports(conn)
+        conn.execute("CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at, report_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS reports_last_accessed ON reports (last_accessed, report_id)")
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS reports (
-                report_id TEXT PRIMARY KEY,
+            CREATE TABLE IF NOT EXISTS outbox (
+                message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                report_id TEXT,
+                recipient TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                attachments TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                last_error TEXT,
                 created_at TEXT NOT NULL,
-                metadata TEXT NOT NULL
+                updated_at TEXT NOT NULL
             )
             """
         )
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+        _create_search_index(conn)
         conn.commit()
+    _INITIALIZED.add(path)
 
 
-def store_report(settings: Settings, report_id: str, metadata: dict[str, Any]) -> None:
+def store_report(
+    settings: Settings, report_id: str, metadata: dict[str, Any], total_bytes: int | None = None
+) -> None:
+    """Insert or replace a report row.
+
+    ``total_bytes`` is the on-disk size of the report's files; when omitted it
+    is taken from the paths in ``metadata`` so size-budget eviction never has
+    to walk the storage directories.
+    """
     init_db(settings)
+    if total_bytes is None:
+        total_bytes = _files_size(report_file_paths(metadata))
     created_at = metadata.get("created_at")
     if isinstance(created_at, datetime):
         created_at_str = created_at.astimezone(timezone.utc).isoformat()
@@ -55,9 +223,15 @@ def store_report(settings: Settings, report_id: str, metadata: dict[str, Any]) -
         created_at_str = datetime.now(timezone.utc).isoformat()
         metadata = {**metadata, "created_at": created_at_str}
     with _connect(settings) as conn:
+        _delete_from_search_index(conn, [report_id])
+        cursor = conn.execute(
+            "INSERT OR REPLACE INTO reports (report_id, created_at, metadata, total_bytes, last_accessed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (report_id, created_at_str, json.dumps(metadata), total_bytes, created_at_str),
+        )
         conn.execute(
-            "INSERT OR REPLACE INTO reports (report_id, created_at, metadata) VALUES (?, ?, ?)",
-            (report_id, created_at_str, json.dumps(metadata)),
+            "INSERT INTO reports_fts (rowid, vin, email, notes, codes) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, *search_fields(metadata)),
         )
         conn.commit()
 
@@ -79,6 +253,22 @@ def list_reports(settings: Settings) -> List[ReportRecord]:
     return records
 
 
+def get_report(settings: Settings, report_id: str) -> ReportRecord | None:
+    init_db(settings)
+    with _connect(settings) as conn:
+        row = conn.execute(
+            "SELECT report_id, created_at, metadata FROM reports WHERE report_id = ?",
+            (report_id,),
+        ).fetchone()
+    if row is None:
+        return None
+    return ReportRecord(
+        report_id=row[0],
+        created_at=datetime.fromisoformat(row[1]).astimezone(timezone.utc),
+        metadata=json.loads(row[2]),
+    )
+
+
 def get_reports_older_than(settings: Settings, cutoff: datetime) -> List[ReportRecord]:
     init_db(settings)
     cutoff_iso = cutoff.astimezone(timezone.utc).isoformat()
@@ -99,8 +289,293 @@ def get_reports_older_than(settings: Settings, cutoff: datetime) -> List[ReportR
     return results
 
 
+def get_reports_older_than_batch(
+    settings: Settings,
+    cutoff: datetime,
+    limit: int,
+    after: tuple[str, str] | None = None,
+) -> List[ReportRecord]:
+    """Return at most ``limit`` expired reports ordered by ``(created_at, report_id)``.
+
+    ``after`` is the ``(sort_key, report_id)`` key of the last row already
+    seen, so callers can page through large result sets with bounded memory.
+    """
+    init_db(settings)
+    cutoff_iso = cutoff.astimezone(timezone.utc).isoformat()
+    query = "SELECT report_id, created_at, metadata FROM reports WHERE created_at < ?"
+    params: list[Any] = [cutoff_iso]
+    if after is not None:
+        query += " AND (created_at, report_id) > (?, ?)"
+        params.extend(after)
+    query += " ORDER BY created_at, report_id LIMIT ?"
+    params.append(limit)
+    with _connect(settings) as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [
+        ReportRecord(
+            report_id=report_id,
+            created_at=datetime.fromisoformat(created_at).astimezone(timezone.utc),
+            metadata=json.loads(metadata_json),
+            sort_key=created_at,
+        )
+        for report_id, created_at, metadata_json in rows
+    ]
+
+
+def iter_report_ids(settings: Settings) -> Iterator[str]:
+    init_db(settings)
+    with _connect(settings) as conn:
+        for (report_id,) in conn.execute("SELECT report_id FROM reports"):
+            yield report_id
+
+
+def replace_report_path(
+    settings: Settings, report_id: str, key: str, old_path: str, new_path: str, size_delta: int = 0
+) -> bool:
+    """Atomically point metadata ``key`` at ``new_path`` if it still holds ``old_path``."""
+    init_db(settings)
+    json_path = f"$.{key}"
+    with _connect(settings) as conn:
+        cursor = conn.execute(
+            "UPDATE reports SET metadata = json_set(metadata, ?, ?), total_bytes = MAX(total_bytes + ?, 0) "
+            "WHERE report_id = ? AND json_extract(metadata, ?) = ?",
+            (json_path, new_path, size_delta, report_id, json_path, old_path),
+        )
+        conn.commit()
+        return cursor.rowcount == 1
+
+
+def touch_report(settings: Settings, report_id: str) -> None:
+    init_db(settings)
+    with _connect(settings) as conn:
+        conn.execute(
+            "UPDATE reports SET last_accessed = ? WHERE report_id = ?",
+            (datetime.now(timezone.utc).isoformat(), report_id),
+        )
+        conn.commit()
+
+
+def total_storage_bytes(settings: Settings) -> int:
+    init_db(settings)
+    with _connect(settings) as conn:
+        (total,) = conn.execute("SELECT COALESCE(SUM(total_bytes), 0) FROM reports").fetchone()
+    return int(total)
+
+
+def get_eviction_candidates(
+    settings: Settings, policy: str, limit: int, after: tuple[str, str] | None = None
+) -> List[EvictionCandidate]:
+    """Return the next ``limit`` reports to evict under ``policy`` ("oldest" or "lru")."""
+    column = EVICTION_ORDER[policy]
+    init_db(settings)
+    query = f"SELECT report_id, {column}, total_bytes, metadata FROM reports"
+    params: list[Any] = []
+    if after is not None:
+        query += f" WHERE ({column}, report_id) > (?, ?)"
+        params.extend(after)
+    query += f" ORDER BY {column}, report_id LIMIT ?"
+    params.append(limit)
+    with _connect(settings) as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [
+        EvictionCandidate(report_id=report_id, sort_key=sort_key, total_bytes=total_bytes, metadata=json.loads(metadata))
+        for report_id, sort_key, total_bytes, metadata in rows
+    ]
+
+
+def _delete_from_search_index(conn: sqlite3.Connection, report_ids: Iterable[str]) -> None:
+    conn.executemany(
+        "DELETE FROM reports_fts WHERE rowid = (SELECT id FROM reports WHERE report_id = ?)",
+        [(rid,) for rid in report_ids],
+    )
+
+
 def delete_reports(settings: Settings, report_ids: Iterable[str]) -> None:
     init_db(settings)
+    report_ids = list(report_ids)
     with _connect(settings) as conn:
+        _delete_from_search_index(conn, report_ids)
         conn.executemany("DELETE FROM reports WHERE report_id = ?", [(rid,) for rid in report_ids])
         conn.commit()
+
+
+def _match_expression(query: str) -> str | None:
+    """Turn free text into an FTS5 query: every term must match, as a literal substring."""
+    terms = [term.replace('"', '""') for term in query.split() if len(term) >= 3]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def search_reports(
+    settings: Settings, query: str, limit: int = 20, offset: int = 0
+) -> tuple[int, bool, List[SearchHit]]:
+    """Full-text search over VIN, email, notes and code descriptions.
+
+    Returns ``(total, capped, hits)``: the number of matches, whether counting
+    stopped early, and one page of hits. Terms shorter than three characters
+    are ignored. Matches are ordered by BM25 rank, except that a query matching
+    more than ``SEARCH_RANK_LIMIT`` reports is returned newest first with
+    ``capped`` set and ``total`` only a lower bound: ranking or counting every
+    row of a broad query costs far more than the lookup itself.
+    """
+    init_db(settings)
+    expression = _match_expression(query)
+    if expression is None:
+        return 0, False, []
+    with _connect(settings) as conn:
+        (total,) = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM reports_fts WHERE reports_fts MATCH ? LIMIT ?)",
+            (expression, SEARCH_RANK_LIMIT + 1),
+        ).fetchone()
+        capped = total > SEARCH_RANK_LIMIT
+        if capped:
+            # Selecting ``rank`` would make FTS5 score every match; sorting the
+            # matched ids by created_at is cheaper and needs no phrase data.
+            rows = conn.execute(
+                """
+                SELECT report_id, created_at, metadata, 0.0 FROM reports
+                WHERE id IN (SELECT rowid FROM reports_fts WHERE reports_fts MATCH ?)
+                ORDER BY created_at DESC, report_id DESC
+                LIMIT ? OFFSET ?
+                """,
+                (expression, limit, offset),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                """
+                SELECT r.report_id, r.created_at, r.metadata, f.rank
+                FROM (
+                    SELECT rowid, rank FROM reports_fts WHERE reports_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?
+                ) AS f
+                JOIN reports AS r ON r.id = f.rowid
+                ORDER BY f.rank, r.created_at DESC
+                """,
+                (expression, limit, offset),
+            ).fetchall()
+    hits = [
+        SearchHit(
+            report_id=report_id,
+            created_at=datetime.fromisoformat(created_at).astimezone(timezone.utc),
+            metadata=json.loads(metadata_json),
+            rank=rank,
+        )
+        for report_id, created_at, metadata_json, rank in rows
+    ]
+    return total, capped, hits
+
+
+def _utc_iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def _outbox_message(row: tuple) -> OutboxMessage:
+    message_id, report_id, recipient, subject, body, attachments, status, attempts, last_error = row
+    return OutboxMessage(
+        message_id=message_id,
+        report_id=report_id,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        attachments=json.loads(attachments),
+        status=status,
+        attempts=attempts,
+        last_error=last_error,
+    )
+
+
+_OUTBOX_COLUMNS = "message_id, report_id, recipient, subject, body, attachments, status, attempts, last_error"
+
+
+def enqueue_email(
+    settings: Settings,
+    report_id: str | None,
+    recipient: str,
+    subject: str,
+    body: str,
+    attachments: Iterable[str] = (),
+) -> int:
+    init_db(settings)
+    now = _utc_iso(datetime.now(timezone.utc))
+    with _connect(settings) as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO outbox (
+                report_id, recipient, subject, body, attachments, status, attempts,
+                next_attempt_at, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
+            """,
+            (report_id, recipient, subject, body, json.dumps(list(attachments)), OUTBOX_PENDING, now, now, now),
+        )
+        conn.commit()
+        return int(cursor.lastrowid)
+
+
+def claim_due_emails(settings: Settings, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+    """Mark up to ``limit`` due messages as being sent and return them.
+
+    Claimed rows are leased until ``now + lease``; if the sender dies before
+    reporting back, the lease expires and another sender picks them up.
+    """
+    init_db(settings)
+    now_iso = _utc_iso(now)
+    lease_until = _utc_iso(now + lease)
+    conn = _connect(settings)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            f"""
+            SELECT {_OUTBOX_COLUMNS} FROM outbox
+            WHERE status IN (?, ?) AND next_attempt_at <= ?
+            ORDER BY next_attempt_at
+            LIMIT ?
+            """,
+            (OUTBOX_PENDING, OUTBOX_SENDING, now_iso, limit),
+        ).fetchall()
+        conn.executemany(
+            "UPDATE outbox SET status = ?, next_attempt_at = ?, updated_at = ? WHERE message_id = ?",
+            [(OUTBOX_SENDING, lease_until, now_iso, row[0]) for row in rows],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return [_outbox_message(row) for row in rows]
+
+
+def mark_email_sent(settings: Settings, message_id: int) -> None:
+    now = _utc_iso(datetime.now(timezone.utc))
+    with _connect(settings) as conn:
+        conn.execute(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? "
+            "WHERE message_id = ?",
+            (OUTBOX_SENT, now, message_id),
+        )
+        conn.commit()
+
+
+def mark_email_failed(
+    settings: Settings, message_id: int, error: str, retry_at: datetime | None
+) -> None:
+    """Record a failed attempt; ``retry_at=None`` moves the message to the dead letters."""
+    now = _utc_iso(datetime.now(timezone.utc))
+    status = OUTBOX_DEAD if retry_at is None else OUTBOX_PENDING
+    next_attempt = now if retry_at is None else _utc_iso(retry_at)
+    with _connect(settings) as conn:
+        conn.execute(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?, next_attempt_at = ?, "
+            "updated_at = ? WHERE message_id = ?",
+            (status, error, next_attempt, now, message_id),
+        )
+        conn.commit()
+
+
+def list_outbox(settings: Settings, status: str | None = None) -> List[OutboxMessage]:
+    init_db(settings)
+    query = f"SELECT {_OUTBOX_COLUMNS} FROM outbox"
+    params: tuple = ()
+    if status is not None:
+        query += " WHERE status = ?"
+        params = (status,)
+    with _connect(settings) as conn:
+        rows = conn.execute(query + " ORDER BY message_id", params).fetchall()
+    return [_outbox_message(row) for row in rows]
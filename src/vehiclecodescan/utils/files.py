@@ -1,15 +1,40 @@
 from __future__ import annotations
 
+import gzip
+import io
 import mimetypes
 import os
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import IO, TYPE_CHECKING, BinaryIO, Iterable
 
-from werkzeug.datastructures import FileStorage
-from werkzeug.utils import secure_filename
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+if TYPE_CHECKING:  # werkzeug is only needed by the web upload path
+    from werkzeug.datastructures import FileStorage
 
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg"}
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+# Start-of-frame markers carry the image dimensions; C4 (DHT), C8 (JPG) and CC
+# (DAC) share the range but are not frames.
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+_JPEG_MAX_SEGMENTS = 512
+
+
+@dataclass(frozen=True)
+class JpegInfo:
+    width: int
+    height: int
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
 
 
 def ensure_directory(path: Path) -> None:
@@ -21,12 +46,99 @@ def is_allowed_image(filename: str) -> bool:
     return extension in ALLOWED_IMAGE_EXTENSIONS
 
 
+def read_jpeg_info(stream: BinaryIO) -> JpegInfo | None:
+    """Read a JPEG's dimensions from its SOI and SOF markers without decoding it.
+
+    Only segment headers are read; segment bodies are skipped. Returns ``None``
+    if the stream is not a JPEG or ends before a frame header.
+    """
+    if stream.read(2) != b"\xff\xd8":
+        return None
+    for _ in range(_JPEG_MAX_SEGMENTS):
+        byte = stream.read(1)
+        if byte != b"\xff":
+            return None
+        marker = 0xFF
+        while marker == 0xFF:
+            raw = stream.read(1)
+            if not raw:
+                return None
+            marker = raw[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (0xD8, 0xD9, 0xDA):
+            # A second SOI, EOI or start of scan before any frame header.
+            return None
+        length_bytes = stream.read(2)
+        if len(length_bytes) != 2:
+            return None
+        length = int.from_bytes(length_bytes, "big")
+        if length < 2:
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            header = stream.read(5)
+            if len(header) != 5:
+                return None
+            height = int.from_bytes(header[1:3], "big")
+            width = int.from_bytes(header[3:5], "big")
+            if not width or not height:
+                return None
+            return JpegInfo(width=width, height=height)
+        if stream.seekable():
+            stream.seek(length - 2, os.SEEK_CUR)
+        elif len(stream.read(length - 2)) != length - 2:
+            return None
+    return None
+
+
+def inspect_jpeg_upload(file: FileStorage) -> JpegInfo | None:
+    """Probe an uploaded file's JPEG header and rewind it for saving."""
+    stream = file.stream
+    position = stream.tell()
+    try:
+        return read_jpeg_info(stream)
+    finally:
+        stream.seek(position)
+
+
+def image_within_limits(info: JpegInfo, max_pixels: int, max_dimension: int) -> bool:
+    return info.pixels <= max_pixels and max(info.width, info.height) <= max_dimension
+
+
+def inspect_jpeg_file(path: Path) -> JpegInfo | None:
+    with path.open("rb") as handle:
+        return read_jpeg_info(handle)
+
+
 def is_probably_text(path: Path) -> bool:
     mime, _ = mimetypes.guess_type(path.name)
     return mime in {"text/plain", "text/csv", "application/csv"}
 
 
+def logical_suffix(path: Path) -> str:
+    """Return the file's own suffix, ignoring a trailing compression suffix."""
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSED_SUFFIXES:
+        suffixes.pop()
+    return suffixes[-1] if suffixes else ""
+
+
+def open_text(path: Path, encoding: str = "utf-8", errors: str | None = None, newline: str | None = None) -> IO[str]:
+    """Open a text file for reading, transparently decompressing ``.gz``/``.zst`` files."""
+    codec = COMPRESSED_SUFFIXES.get(path.suffix.lower())
+    if codec == "gzip":
+        return gzip.open(path, "rt", encoding=encoding, errors=errors, newline=newline)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst files")
+        raw = zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding=encoding, errors=errors, newline=newline)
+    return path.open("r", encoding=encoding, errors=errors, newline=newline)
+
+
 def save_upload(file: FileStorage, destination: Path, prefix: str | None = None) -> Path:
+    from werkzeug.utils import secure_filename
+
     ensure_directory(destination)
     original = secure_filename(file.filename or "upload")
     extension = Path(original).suffix or ".bin"
@@ -37,9 +149,16 @@ def save_upload(file: FileStorage, destination: Path, prefix: str | None = None)
     return target
 
 
-def remove_files(paths: Iterable[os.PathLike[str] | str]) -> None:
-    for path in paths:
-        try:
-            Path(path).unlink(missing_ok=True)
-        except OSError:
-            continue
+def remove_file(path: os.PathLike[str] | str) -> int:
+    """Delete ``path`` if it exists and return the number of bytes freed."""
+    target = Path(path)
+    try:
+        size = target.stat().st_size
+        target.unlink()
+    except OSError:
+        return 0
+    return size
+
+
+def remove_files(paths: Iterable[os.PathLike[str] | str]) -> int:
+    return sum(remove_file(path) for path in paths)
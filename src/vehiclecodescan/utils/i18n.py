@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+import string
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Mapping
 
 # Attempt to locate the project root where the i18n directory lives. This allows
 # the module to function both when run from the repository as well as when the
@@ -23,6 +24,9 @@ else:  # pragma: no cover - fallback for unusual setups
     I18N_DIR = (_MODULE_PATH.parent / "i18n").resolve()
 DEFAULT_LANGUAGE = "en"
 
+_FORMATTER = string.Formatter()
+_CONVERSIONS = {"s": str, "r": repr, "a": ascii}
+
 
 @lru_cache(maxsize=None)
 def _load_language(language: str) -> dict[str, Any]:
@@ -35,26 +39,110 @@ def _load_language(language: str) -> dict[str, Any]:
         return json.load(handle)
 
 
-def _lookup(data: dict[str, Any], key: str) -> Any:
-    current: Any = data
-    for part in key.split("."):
-        if isinstance(current, dict) and part in current:
-            current = current[part]
+class _Template:
+    """A translation string with its replacement fields parsed once.
+
+    Strings without fields render as-is. Simple ``{name}``/``{name:spec}``/
+    ``{name!r}`` fields are filled directly from the keyword arguments; anything
+    fancier (attribute or index access, nested specs, positional fields) falls
+    back to ``str.format`` so behaviour matches the raw string exactly.
+    """
+
+    __slots__ = ("text", "parts", "simple")
+
+    def __init__(self, text: str, formattable: bool = True):
+        self.text = text
+        self.parts: tuple[tuple[str, str | None, str, str | None], ...] | None = None
+        self.simple = True
+        if not formattable or ("{" not in text and "}" not in text):
+            return
+        parts = []
+        for literal, field, spec, conversion in _FORMATTER.parse(text):
+            if field is not None and (not field.isidentifier() or "{" in (spec or "")):
+                self.simple = False
+            parts.append((literal, field, spec or "", conversion))
+        self.parts = tuple(parts)
+
+    def render(self, kwargs: dict[str, Any]) -> str:
+        if self.parts is None:
+            return self.text
+        if not self.simple:
+            return self.text.format(**kwargs)
+        chunks = []
+        for literal, field, spec, conversion in self.parts:
+            chunks.append(literal)
+            if field is None:
+                continue
+            value = kwargs[field]
+            if conversion is not None:
+                value = _CONVERSIONS[conversion](value)
+            chunks.append(format(value, spec))
+        return "".join(chunks)
+
+
+def _flatten(data: dict[str, Any], prefix: str = "", into: dict[str, _Template] | None = None) -> dict[str, _Template]:
+    flat = {} if into is None else into
+    for key, value in data.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _flatten(value, f"{dotted}.", flat)
+        elif isinstance(value, str):
+            flat[dotted] = _Template(value)
         else:
-            return None
-    return current
+            flat[dotted] = _Template(str(value), formattable=False)
+    return flat
+
+
+@lru_cache(maxsize=None)
+def _catalog(language: str) -> dict[str, _Template]:
+    """Single-level ``dotted.key -> template`` map with the English fallback merged in."""
+    flat = _flatten(_load_language(DEFAULT_LANGUAGE))
+    if language != DEFAULT_LANGUAGE:
+        _flatten(_load_language(language), into=flat)
+    return flat
+
+
+@lru_cache(maxsize=1024)
+def _compile(text: str) -> _Template:
+    return _Template(text)
 
 
 def translate(key: str, language: str, default: str | None = None, **kwargs: Any) -> str:
-    value = _lookup(_load_language(language), key)
-    if value is None and language != DEFAULT_LANGUAGE:
-        value = _lookup(_load_language(DEFAULT_LANGUAGE), key)
-    if value is None:
-        value = default if default is not None else key
-    if isinstance(value, str):
-        return value.format(**kwargs)
-    return str(value)
+    template = _catalog(language).get(key)
+    if template is None:
+        template = _compile(default if default is not None else key)
+    return template.render(kwargs)
+
+
+def translate_many(
+    keys: Iterable[str],
+    language: str,
+    defaults: Mapping[str, str] | None = None,
+    **kwargs: Any,
+) -> list[str]:
+    """Translate several keys at once, sharing one catalog lookup and ``kwargs``."""
+    catalog = _catalog(language)
+    defaults = defaults or {}
+    results = []
+    for key in keys:
+        template = catalog.get(key)
+        if template is None:
+            template = _compile(defaults.get(key, key))
+        results.append(template.render(kwargs))
+    return results
+
+
+@lru_cache(maxsize=1)
+def _discover_languages() -> tuple[str, ...]:
+    return tuple(sorted(path.stem for path in I18N_DIR.glob("*.json")))
 
 
 def available_languages() -> list[str]:
-    return [path.stem for path in I18N_DIR.glob("*.json")]
+    return list(_discover_languages())
+
+
+def preload_catalogs() -> None:
+    """Load every shipped catalog so worker processes share them after fork."""
+    for language in _discover_languages():
+        _catalog(language)
+    _catalog(DEFAULT_LANGUAGE)
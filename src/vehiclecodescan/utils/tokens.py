@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import secrets
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+_DOWNLOAD_SALT = "report-download"
+
+
+def _download_serializer(secret_key: str) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(secret_key, salt=_DOWNLOAD_SALT)
+
+
+def make_download_token(secret_key: str, report_id: str) -> str:
+    return _download_serializer(secret_key).dumps(report_id)
+
+
+def check_download_token(secret_key: str, token: str, report_id: str, max_age: int) -> bool:
+    try:
+        signed_id = _download_serializer(secret_key).loads(token, max_age=max_age)
+    except BadSignature:
+        return False
+    return secrets.compare_digest(str(signed_id), report_id)
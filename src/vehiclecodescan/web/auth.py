@@ -6,6 +6,8 @@ from typing import Callable, TypeVar, cast
 
 from flask import Response, current_app, request
 
+from ..utils import tokens
+
 F = TypeVar("F", bound=Callable[..., Response])
 
 
@@ -29,3 +31,28 @@ def requires_auth(func: F) -> F:
         return func(*args, **kwargs)
 
     return cast(F, wrapper)
+
+
+def make_download_token(report_id: str) -> str:
+    return tokens.make_download_token(current_app.config["SETTINGS"].secret_key, report_id)
+
+
+def _check_download_token(token: str, report_id: str) -> bool:
+    settings = current_app.config["SETTINGS"]
+    return tokens.check_download_token(settings.secret_key, token, report_id, settings.download_link_ttl)
+
+
+def requires_auth_or_token(func: F) -> F:
+    """Like ``requires_auth`` but also admits a signed, unexpired ``?token=`` for the report."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):  # type: ignore[override]
+        token = request.args.get("token")
+        if token and _check_download_token(token, kwargs.get("report_id", "")):
+            return func(*args, **kwargs)
+        auth = request.authorization
+        if not auth or not _check_auth(auth.username, auth.password):
+            return _authenticate()
+        return func(*args, **kwargs)
+
+    return cast(F, wrapper)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from functools import wraps
+from typing import Callable, TypeVar, cast
+
+from flask import Response, current_app, request
+
+from ..config import Settings
+from ..utils.i18n import available_languages
+
+F = TypeVar("F", bound=Callable[..., Response])
+
+EXTENSION_KEY = "vehiclecodescan.admission"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> tuple[bool, float]:
+        """Take a token, waiting at most ``max_wait`` seconds for one to accrue.
+
+        Returns ``(True, wait)`` when a token was reserved and the caller should
+        sleep ``wait`` seconds before proceeding, or ``(False, retry_after)``
+        when the wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return False, wait
+            self._tokens -= 1
+            return True, wait
+
+    def refund(self) -> None:
+        """Give back a token reserved for a request that was then refused."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class RenderSlots:
+    """A counting semaphore whose callers take several slots at once, atomically.
+
+    Taking slots one by one would let two requests each hold part of what they
+    need and wait on each other until both time out.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, count: int, timeout: float) -> bool:
+        count = min(count, self.capacity)
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_use + count <= self.capacity, timeout):
+                return False
+            self._in_use += count
+            return True
+
+    def release(self, count: int) -> None:
+        with self._condition:
+            self._in_use -= min(count, self.capacity)
+            self._condition.notify_all()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_concurrent: int,
+        queue_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_minute = rate_per_minute
+        self.burst = max(burst, 1)
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._slots = RenderSlots(max_concurrent) if max_concurrent > 0 else None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AdmissionController":
+        return cls(
+            rate_per_minute=settings.rate_limit_per_minute,
+            burst=settings.rate_limit_burst,
+            max_concurrent=settings.max_concurrent_renders,
+            queue_timeout=settings.admission_timeout,
+        )
+
+    def _bucket(self, client: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_minute / 60.0, self.burst, self._clock)
+                self._buckets[client] = bucket
+            return bucket
+
+    def admit(self, client: str, max_wait: float | None = None) -> float | None:
+        """Consume a rate-limit token for ``client``; return a retry delay if refused."""
+        if self.rate_per_minute <= 0:
+            return None
+        max_wait = self.queue_timeout if max_wait is None else max_wait
+        granted, wait = self._bucket(client).reserve(max_wait)
+        if not granted:
+            return wait
+        if wait > 0:
+            time.sleep(wait)
+        return None
+
+    def refund(self, client: str) -> None:
+        if self.rate_per_minute > 0:
+            self._bucket(client).refund()
+
+    def acquire_slot(self, renders: int = 1, timeout: float | None = None) -> bool:
+        """Reserve one render slot per PDF the request will render."""
+        if self._slots is None:
+            return True
+        return self._slots.acquire(renders, self.queue_timeout if timeout is None else timeout)
+
+    def release_slot(self, renders: int = 1) -> None:
+        if self._slots is not None:
+            self._slots.release(renders)
+
+    def enter(self, client: str, renders: int = 1) -> float | None:
+        """Admit a request and reserve its render slots within one ``queue_timeout``.
+
+        Returns ``None`` once admitted (call ``release_slot`` when done) or the
+        ``Retry-After`` delay when refused. A request refused for lack of a slot
+        gets its rate-limit token back.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        retry_after = self.admit(client, self.queue_timeout)
+        if retry_after is not None:
+            return retry_after
+        if not self.acquire_slot(renders, max(deadline - time.monotonic(), 0.0)):
+            self.refund(client)
+            return self.queue_timeout or 1
+        return None
+
+
+def _too_many_requests(retry_after: float) -> Response:
+    return Response("Too many requests", 429, {"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+
+def admission_control(func: F) -> F:
+    """Rate-limit report submissions per user and cap concurrent renders.
+
+    Must be applied inside ``requires_auth`` so the client is known. Only POST
+    requests are metered. A submission takes one render slot per selected
+    report language, held until the view returns; waiting for a token and for
+    the slots together never exceeds ``queue_timeout``.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):  # type: ignore[override]
+        if request.method != "POST":
+            return func(*args, **kwargs)
+        controller: AdmissionController = current_app.extensions[EXTENSION_KEY]
+        auth = request.authorization
+        client = auth.username if auth and auth.username else (request.remote_addr or "anonymous")
+        renders = max(len(set(request.form.getlist("language")) & set(available_languages())), 1)
+        retry_after = controller.enter(client, renders)
+        if retry_after is not None:
+            return _too_many_requests(retry_after)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            controller.release_slot(renders)
+
+    return cast(F, wrapper)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, TypeVar, cast
+
+from flask import Response, current_app, g, request
+
+from ..config import Settings
+from ..utils.files import ensure_directory
+
+F = TypeVar("F", bound=Callable[..., Response])
+
+# Authenticated requests carrying this header are profiled even when
+# APP_PROFILE is off; it is only read inside ``requires_auth``.
+PROFILE_HEADER = "X-Profile"
+PROFILE_DIRNAME = "profiles"
+
+# From Python 3.12 cProfile hooks in through ``sys.monitoring``, which admits a
+# single profiler per process, so profiled requests take turns.
+_PROFILE_LOCK = threading.Lock()
+
+
+def profile_dir(settings: Settings) -> Path:
+    return settings.storage_root / PROFILE_DIRNAME
+
+
+def is_profiling() -> bool:
+    return "profile_details" in g
+
+
+def annotate_profile(**details: Any) -> None:
+    """Record details about the profiled request in its sidecar; a no-op otherwise."""
+    if is_profiling():
+        g.profile_details.update(details)
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    with os.scandir(directory) as entries:
+        dumps = sorted(entry.name for entry in entries if entry.name.endswith(".prof"))
+    for name in dumps[: max(len(dumps) - keep, 0)]:
+        (directory / name).unlink(missing_ok=True)
+        (directory / name).with_suffix(".json").unlink(missing_ok=True)
+
+
+def _write_profile(settings: Settings, profile: cProfile.Profile, details: dict[str, Any]) -> Path:
+    directory = profile_dir(settings)
+    ensure_directory(directory)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    path = directory / f"{stamp}_{details.get('report_id') or 'request'}.prof"
+    profile.dump_stats(str(path))
+    with path.with_suffix(".json").open("w", encoding="utf-8") as handle:
+        json.dump(details, handle, indent=2, default=str)
+    _rotate(directory, max(settings.profile_keep, 1))
+    return path
+
+
+def profiled(func: F) -> F:
+    """Profile POST requests with cProfile when APP_PROFILE is on or ``X-Profile: 1`` is sent.
+
+    Each profile is written to ``storage_root/profiles`` as ``<time>_<report_id>.prof``
+    next to a JSON sidecar with the details passed to ``annotate_profile``;
+    only the newest ``APP_PROFILE_KEEP`` profiles are kept. One request is
+    profiled at a time; others arriving meanwhile are served unprofiled.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):  # type: ignore[override]
+        settings: Settings = current_app.config["SETTINGS"]
+        requested = request.headers.get(PROFILE_HEADER, "").lower() in {"1", "true"}
+        if request.method != "POST" or not (settings.profile_uploads or requested):
+            return func(*args, **kwargs)
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            # Another request is being profiled; don't hold this one up waiting.
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # A profiler started outside the app (``python -m cProfile``) is active.
+            _PROFILE_LOCK.release()
+            return func(*args, **kwargs)
+        g.profile_details = {"path": request.path, "started_at": datetime.now(timezone.utc)}
+        started = time.perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        finally:
+            profile.disable()
+            _PROFILE_LOCK.release()
+            details = g.pop("profile_details")
+            details["elapsed_s"] = round(time.perf_counter() - started, 4)
+            try:
+                _write_profile(settings, profile, details)
+            except OSError as exc:  # pragma: no cover - never fail the request over a profile
+                current_app.logger.warning("Could not write profile: %s", exc)
+        return response
+
+    return cast(F, wrapper)
@@ -7,28 +7,38 @@ from functools import partial
 from pathlib import Path
 from typing import Any
 
-from flask import Blueprint, Response, current_app, render_template, request
+from flask import Blueprint, Response, abort, current_app, jsonify, render_template, request, send_file, url_for
 
-from ..email.send import send_report
+from ..email.compose import compose_report_email
+from ..email.outbox import ensure_sender
 from ..parser.foxwell import parse_foxwell_output
 from ..parser.interpret import interpret_codes
-from ..report.generator import ReportContext, VehicleInfo, generate_report
+from ..report.generator import ReportContext, VehicleInfo
+from ..report.render import render_reports
 from ..storage import models
-from ..utils.files import is_allowed_image, save_upload
+from ..utils.files import image_within_limits, inspect_jpeg_upload, is_allowed_image, save_upload
 from ..utils.i18n import available_languages, translate
-from .auth import requires_auth
+from .auth import make_download_token, requires_auth, requires_auth_or_token
+from .limits import admission_control
+from .profiling import annotate_profile, is_profiling, profiled
 
 web_bp = Blueprint("web", __name__)
 
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
 
 @web_bp.route("/", methods=["GET", "POST"])
 @requires_auth
+@admission_control
+@profiled
 def upload() -> Response | str:
     settings = current_app.config["SETTINGS"]
-    language = request.form.get("language", "en")
-    language_options = sorted(set(available_languages())) or ["en"]
-    if language not in language_options:
-        language = "en"
+    language_options = available_languages() or ["en"]
+    # Several languages may be chosen; the first one is used for the page and the email.
+    languages = [lang for lang in dict.fromkeys(request.form.getlist("language")) if lang in language_options]
+    languages = languages or ["en"]
+    language = languages[0]
 
     localize = partial(translate, language=language)
     errors: list[str] = []
@@ -48,6 +58,7 @@ def upload() -> Response | str:
             errors.append(localize("upload.errors.missing_email", default="Email address is required."))
 
         image_paths: list[Path] = []
+        image_sizes: list[tuple[int, int]] = []
         if not errors:
             invalid_images = [img.filename for img in images if img and img.filename and not is_allowed_image(img.filename)]
             if invalid_images:
@@ -58,12 +69,43 @@ def upload() -> Response | str:
                         filenames=", ".join(filter(None, invalid_images)),
                     )
                 )
+            else:
+                not_jpeg: list[str] = []
+                oversized: list[str] = []
+                for image in images:
+                    if not (image and image.filename):
+                        continue
+                    info = inspect_jpeg_upload(image)
+                    if info is None:
+                        not_jpeg.append(image.filename)
+                    elif not image_within_limits(info, settings.max_image_pixels, settings.max_image_dimension):
+                        oversized.append(image.filename)
+                    else:
+                        image_sizes.append((info.width, info.height))
+                if not_jpeg:
+                    errors.append(
+                        localize(
+                            "upload.errors.not_jpeg",
+                            default="These files are not valid JPEG images: {filenames}",
+                            filenames=", ".join(not_jpeg),
+                        )
+                    )
+                if oversized:
+                    errors.append(
+                        localize(
+                            "upload.errors.image_too_large",
+                            default="Images must be at most {megapixels} megapixels ({filenames}).",
+                            megapixels=settings.max_image_pixels // 1_000_000,
+                            filenames=", ".join(oversized),
+                        )
+                    )
 
         if errors:
             return render_template(
                 "upload.html",
                 language=language,
                 languages=language_options,
+                selected_languages=languages,
                 errors=errors,
                 summary=summary,
                 translate=localize,
@@ -94,61 +136,87 @@ def upload() -> Response | str:
                 "upload.html",
                 language=language,
                 languages=language_options,
+                selected_languages=languages,
                 errors=errors,
                 summary=summary,
                 translate=localize,
             )
 
-        interpreted = interpret_codes(raw_entries, language)
-
-        report_context = ReportContext(
-            report_id=report_id,
-            created_at=created_at,
-            language=language,
-            vehicle=VehicleInfo(vin=vin, mileage=mileage, notes=notes),
-            codes=interpreted,
-            images=image_paths,
-        )
-        pdf_path = generate_report(report_context, settings)
-
-        subject = localize(
-            "email.subject",
-            default="Vehicle diagnostic report for {vin}",
-            vin=vin or report_id,
-        )
-        body = localize(
-            "email.body",
-            default=(
-                "Attached is the diagnostic report for your vehicle. \n\n"
-                "Report ID: {report_id}\nDetected codes: {codes}"
-            ),
-            report_id=report_id,
-            codes=", ".join(code.code for code in interpreted) or localize(
-                "report.diagnostics.no_codes",
-                default="None",
-            ),
-        )
-        email_sent = send_report(recipient, subject, body, pdf_path, settings)
+        vehicle = VehicleInfo(vin=vin, mileage=mileage, notes=notes)
+        contexts = [
+            ReportContext(
+                report_id=report_id,
+                created_at=created_at,
+                language=lang,
+                vehicle=vehicle,
+                codes=interpret_codes(raw_entries, lang, vin),
+                images=image_paths,
+                image_sizes=image_sizes,
+            )
+            for lang in languages
+        ]
+        pdf_paths = dict(zip(languages, render_reports(contexts, settings, inline=is_profiling())))
+        pdf_path = pdf_paths[language]
+        interpreted = contexts[0].codes
 
         metadata = {
             "created_at": created_at,
             "scanner_file": str(scanner_path),
             "image_paths": [str(path) for path in image_paths],
             "pdf_path": str(pdf_path),
+            "pdf_paths": {lang: str(path) for lang, path in pdf_paths.items()},
             "email": recipient,
             "language": language,
-            "vehicle": asdict(report_context.vehicle),
+            "languages": languages,
+            "vehicle": asdict(vehicle),
             "codes": [asdict(code) for code in interpreted],
         }
         models.store_report(settings, report_id, metadata)
 
+        email_queued = settings.mail is not None
+        if email_queued:
+            attachments = [str(path) for path in pdf_paths.values()]
+            links: dict[str, str] | None = None
+            if sum(path.stat().st_size for path in pdf_paths.values()) > settings.mail.attachment_limit:
+                # Too large to attach: send expiring download links instead.
+                token = make_download_token(report_id)
+                links = {
+                    lang: url_for(
+                        "web.download_report",
+                        report_id=report_id,
+                        lang=lang if lang != language else None,
+                        token=token,
+                        _external=True,
+                    )
+                    for lang in languages
+                }
+                attachments = []
+            subject, body = compose_report_email(
+                report_id,
+                vin,
+                [code.code for code in interpreted],
+                language,
+                links=links,
+                link_ttl=settings.download_link_ttl,
+            )
+            models.enqueue_email(settings, report_id, recipient, subject, body, attachments)
+            if settings.outbox_background:
+                ensure_sender(settings)
+
+        annotate_profile(
+            report_id=report_id,
+            codes=len(interpreted),
+            images=len(image_paths),
+            languages=languages,
+            pdf_bytes={lang: path.stat().st_size for lang, path in pdf_paths.items()},
+        )
         summary = {
             "report_id": report_id,
             "created_at": created_at,
-            "email_sent": email_sent,
+            "email_queued": email_queued,
             "pdf_path": pdf_path,
             "codes": interpreted,
-            "vehicle": report_context.vehicle,
+            "vehicle": vehicle,
             "email": recipient,
         }
 
@@ -156,7 +224,76 @@ def upload() -> Response | str:
         "upload.html",
         language=language,
         languages=language_options,
+        selected_languages=languages,
         errors=errors,
         summary=summary,
         translate=localize,
     )
+
+
+@web_bp.route("/reports/<report_id>.pdf")
+@requires_auth_or_token
+def download_report(report_id: str) -> Response:
+    settings = current_app.config["SETTINGS"]
+    record = models.get_report(settings, report_id)
+    if record is None:
+        abort(404)
+    lang = request.args.get("lang")
+    if lang and lang != record.metadata.get("language"):
+        stored_path = (record.metadata.get("pdf_paths") or {}).get(lang)
+    else:
+        stored_path = record.metadata.get("pdf_path")
+    if not stored_path:
+        abort(404)
+    pdf_path = Path(stored_path).resolve()
+    if pdf_path.parent != settings.report_dir.resolve() or not pdf_path.is_file():
+        abort(404)
+    models.touch_report(settings, report_id)
+    # conditional=True gives ETag/Last-Modified validation and Range support;
+    # with USE_X_SENDFILE the body is left to the front-end server.
+    return send_file(
+        pdf_path,
+        mimetype="application/pdf",
+        download_name=pdf_path.name,
+        conditional=True,
+        etag=True,
+        max_age=0,
+    )
+
+
+@web_bp.route("/search")
+@requires_auth
+def search() -> Response:
+    settings = current_app.config["SETTINGS"]
+    query = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int) or 1, 1)
+    per_page = request.args.get("per_page", SEARCH_PAGE_SIZE, type=int) or SEARCH_PAGE_SIZE
+    per_page = min(max(per_page, 1), SEARCH_MAX_PAGE_SIZE)
+    total, capped, hits = models.search_reports(settings, query, limit=per_page, offset=(page - 1) * per_page)
+    results = []
+    for hit in hits:
+        vehicle = hit.metadata.get("vehicle") or {}
+        results.append(
+            {
+                "report_id": hit.report_id,
+                "created_at": hit.created_at.isoformat(),
+                "vin": vehicle.get("vin"),
+                "email": hit.metadata.get("email"),
+                "notes": vehicle.get("notes"),
+                "codes": [code.get("code") for code in hit.metadata.get("codes", [])],
+                "language": hit.metadata.get("language"),
+                "rank": hit.rank,
+                "download_url": url_for("web.download_report", report_id=hit.report_id),
+            }
+        )
+    return jsonify(
+        {
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            # With total_capped, total is a lower bound and results are newest first.
+            "total_capped": capped,
+            "results": results,
+        }
+    )
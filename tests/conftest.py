@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from vehiclecodescan.config import Settings
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    upload_dir = tmp_path / "uploads"
+    report_dir = tmp_path / "reports"
+    upload_dir.mkdir()
+    report_dir.mkdir()
+    return Settings(
+        secret_key="test",
+        storage_root=tmp_path,
+        upload_dir=upload_dir,
+        report_dir=report_dir,
+        mail=None,
+        admin_username="admin",
+        admin_password="password",
+    )
@@ -0,0 +1,20 @@
+from vehiclecodescan.app import create_app
+from vehiclecodescan.parser import interpret
+from vehiclecodescan.report import generator
+from vehiclecodescan.utils import i18n
+
+
+def test_create_app_preloads_shared_assets(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setenv("APP_PRELOAD", "true")
+    interpret._load_database.cache_clear()
+    i18n._catalog.cache_clear()
+    i18n._discover_languages.cache_clear()
+    generator._report_styles.cache_clear()
+
+    create_app()
+
+    assert interpret._load_database.cache_info().currsize == 1
+    assert i18n._discover_languages.cache_info().currsize == 1
+    assert i18n._catalog.cache_info().currsize == len(i18n.available_languages())
+    assert generator._report_styles.cache_info().currsize == 1
@@ -0,0 +1,73 @@
+import json
+import re
+import zipfile
+from dataclasses import replace
+from urllib.parse import parse_qs
+
+from vehiclecodescan.config import MailSettings
+from vehiclecodescan.report.batch import run_batch
+from vehiclecodescan.storage import models
+from vehiclecodescan.utils.tokens import check_download_token
+
+
+def test_run_batch_from_zip(settings, tmp_path):
+    archive = tmp_path / "day.zip"
+    manifest = [
+        {"scanner_file": "van1/scan.csv", "vin": "1HGCM82633A123456", "languages": ["es", "en"]},
+        {"scanner_file": "van2/scan.txt", "email": "owner@example.com"},
+        {"scanner_file": "missing.txt"},
+    ]
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("manifest.json", json.dumps(manifest))
+        bundle.writestr("van1/scan.csv", "Code,Status\nP0300,Pending\n")
+        bundle.writestr("van2/scan.txt", "Found P0420 stored")
+
+    succeeded, failed = run_batch(archive, workers=2, settings=settings)
+
+    assert (succeeded, failed) == (2, 1)
+    records = {record.metadata["vehicle"]["vin"]: record for record in models.list_reports(settings)}
+    spanish = records["1HGCM82633A123456"]
+    assert spanish.metadata["language"] == "es"
+    assert [code["code"] for code in spanish.metadata["codes"]] == ["P0300"]
+    assert spanish.metadata["pdf_paths"]["en"] == str(settings.report_dir / f"{spanish.report_id}_en.pdf")
+    for record in records.values():
+        assert (settings.report_dir / f"{record.report_id}.pdf").exists()
+        assert record.metadata["scanner_file"].startswith(str(settings.upload_dir))
+
+
+def _oversized_batch(settings, tmp_path):
+    source = tmp_path / "day"
+    source.mkdir()
+    (source / "scan.txt").write_text("Found P0420 stored", encoding="utf-8")
+    (source / "manifest.json").write_text(
+        json.dumps([{"scanner_file": "scan.txt", "email": "owner@example.com", "languages": ["en", "es"]}])
+    )
+    mail = MailSettings(
+        server="localhost", port=25, username="", password="", sender="reports@example.com", attachment_limit=1
+    )
+    return source, replace(settings, mail=mail)
+
+
+def test_batch_emails_links_when_reports_exceed_attachment_limit(settings, tmp_path):
+    source, settings = _oversized_batch(settings, tmp_path)
+    settings = replace(settings, external_url="https://reports.example.com/")
+
+    assert run_batch(source, workers=1, send_email=True, settings=settings) == (1, 0)
+
+    (queued,) = models.list_outbox(settings)
+    assert queued.attachments == []
+    links = re.findall(r"https://reports\.example\.com/reports/(\w+)\.pdf\?(\S+)", queued.body)
+    assert [query.startswith("token=") for _, query in links] == [True, False]
+    report_id, query = links[1]
+    params = parse_qs(query)
+    assert params["lang"] == ["es"]
+    assert check_download_token(settings.secret_key, params["token"][0], report_id, settings.download_link_ttl)
+
+
+def test_batch_skips_oversized_email_without_external_url(settings, tmp_path, capsys):
+    source, settings = _oversized_batch(settings, tmp_path)
+
+    assert run_batch(source, workers=1, send_email=True, settings=settings) == (1, 0)
+
+    assert models.list_outbox(settings) == []
+    assert "APP_EXTERNAL_URL" in capsys.readouterr().err
@@ -0,0 +1,127 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from vehiclecodescan.config import MailSettings
+from vehiclecodescan.app import create_app
+from vehiclecodescan.email import outbox
+from vehiclecodescan.email.outbox import OutboxSender
+from vehiclecodescan.email.pool import SMTPPool, close_pools
+from vehiclecodescan.email.send import build_report_message, send_messages, send_report
+from vehiclecodescan.email.testing import LocalSMTPServer
+from vehiclecodescan.storage import models
+
+
+@pytest.fixture
+def smtp_server():
+    with LocalSMTPServer() as server:
+        yield server
+    close_pools()
+
+
+@pytest.fixture
+def mail_settings(smtp_server):
+    return MailSettings(
+        server=smtp_server.host,
+        port=smtp_server.port,
+        username="user",
+        password="secret",
+        sender="reports@example.com",
+        use_tls=False,
+    )
+
+
+def test_send_report_reuses_authenticated_session(settings, smtp_server, mail_settings, tmp_path):
+    settings = replace(settings, mail=mail_settings)
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+
+    for index in range(3):
+        assert send_report(f"user{index}@example.com", "Subject", "Body", pdf_path, settings) is True
+
+    assert len(smtp_server.messages) == 3
+    assert smtp_server.stats.connections == 1
+    assert smtp_server.stats.logins == 1
+    assert smtp_server.stats.noops == 2
+    attachment = next(smtp_server.messages[0].parsed().iter_attachments())
+    assert attachment.get_filename() == "report.pdf"
+
+
+def test_send_messages_batches_on_one_session(settings, smtp_server, mail_settings):
+    settings = replace(settings, mail=mail_settings)
+    messages = [
+        build_report_message(f"user{index}@example.com", "Subject", "Body", [], mail_settings)
+        for index in range(5)
+    ]
+
+    assert send_messages(messages, settings) == 5
+    assert [message.recipients for message in smtp_server.messages] == [
+        [f"user{index}@example.com"] for index in range(5)
+    ]
+    assert smtp_server.stats.connections == 1
+
+
+def test_pool_reconnects_when_idle_session_is_dead(smtp_server, mail_settings):
+    pool = SMTPPool(mail_settings)
+    with pool.connection() as (server, reused):
+        assert reused is False
+    server.close()
+
+    with pool.connection() as (server, reused):
+        assert reused is False
+        assert server.noop()[0] == 250
+    pool.close()
+
+    assert smtp_server.stats.connections == 2
+    assert smtp_server.stats.logins == 2
+
+
+def test_outbox_sender_delivers_queued_email(settings, smtp_server, mail_settings, tmp_path):
+    settings = replace(settings, mail=mail_settings)
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    models.enqueue_email(settings, "abc", "user@example.com", "Subject", "Body", [str(pdf_path)])
+
+    assert OutboxSender(settings).drain_once() == 1
+
+    assert [message.recipients for message in smtp_server.messages] == [["user@example.com"]]
+    (queued,) = models.list_outbox(settings)
+    assert queued.status == models.OUTBOX_SENT
+    assert queued.attempts == 1
+
+
+def test_outbox_sender_backs_off_then_dead_letters(settings):
+    unreachable = MailSettings(
+        server="127.0.0.1", port=1, username="", password="", sender="reports@example.com", use_tls=False
+    )
+    settings = replace(settings, mail=unreachable, outbox_max_attempts=2, outbox_base_delay=0)
+    models.enqueue_email(settings, "abc", "user@example.com", "Subject", "Body")
+    sender = OutboxSender(settings)
+
+    assert sender.drain_once() == 2
+
+    (queued,) = models.list_outbox(settings)
+    assert queued.status == models.OUTBOX_DEAD
+    assert queued.attempts == 2
+    assert "ConnectionRefusedError" in queued.last_error
+
+
+def test_worker_starts_sender_on_first_request(monkeypatch, tmp_path, smtp_server):
+    monkeypatch.setenv("APP_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setenv("APP_PRELOAD", "false")
+    monkeypatch.setenv("MAIL_SERVER", smtp_server.host)
+    monkeypatch.setenv("MAIL_PORT", str(smtp_server.port))
+    monkeypatch.setenv("MAIL_USE_TLS", "false")
+    app = create_app()
+    models.enqueue_email(app.config["SETTINGS"], "abc", "user@example.com", "Subject", "Body")
+
+    try:
+        app.test_client().get("/")
+        deadline = time.monotonic() + 10
+        while not smtp_server.messages and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        outbox._sender.stop()
+
+    assert [message.recipients for message in smtp_server.messages] == [["user@example.com"]]
@@ -0,0 +1,36 @@
+import io
+
+from PIL import Image
+
+from vehiclecodescan.utils.files import image_within_limits, read_jpeg_info
+
+
+def _jpeg(width, height, **options):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height)).save(buffer, format="JPEG", **options)
+    buffer.seek(0)
+    return buffer
+
+
+def test_read_jpeg_info_reads_frame_header():
+    info = read_jpeg_info(_jpeg(320, 200, exif=b"Exif\x00\x00" + b"\x00" * 2048))
+    assert (info.width, info.height, info.pixels) == (320, 200, 64000)
+
+    progressive = read_jpeg_info(_jpeg(64, 48, progressive=True))
+    assert (progressive.width, progressive.height) == (64, 48)
+
+
+def test_read_jpeg_info_rejects_other_content():
+    png = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(png, format="PNG")
+    png.seek(0)
+
+    assert read_jpeg_info(png) is None
+    assert read_jpeg_info(io.BytesIO(b"\xff\xd8\xff\xe0\x00")) is None
+
+
+def test_image_within_limits():
+    info = read_jpeg_info(_jpeg(300, 200))
+    assert image_within_limits(info, max_pixels=60000, max_dimension=300)
+    assert not image_within_limits(info, max_pixels=59999, max_dimension=300)
+    assert not image_within_limits(info, max_pixels=60000, max_dimension=299)
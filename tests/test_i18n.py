@@ -0,0 +1,33 @@
+from vehiclecodescan.utils.i18n import _Template, translate, translate_many
+
+
+def test_translate_uses_catalog_and_english_fallback():
+    assert translate("report.vehicle.vin", "es") == "VIN"
+    assert translate("upload.success.message", "en", report_id="abc") == "Report abc created successfully."
+    assert translate("missing.key", "es", default="Code {code}", code="P0300") == "Code P0300"
+    assert translate("missing.key", "es") == "missing.key"
+
+
+def test_template_matches_str_format():
+    cases = [
+        ("plain text", {}),
+        ("{{literal}} {name}", {"name": "x"}),
+        ("{value:>6.2f}|{name!r}", {"value": 3.14159, "name": "x"}),
+        ("{item[0]} {obj.real}", {"item": ["a"], "obj": 5}),
+    ]
+    for text, kwargs in cases:
+        assert _Template(text).render(kwargs) == text.format(**kwargs)
+
+
+def test_translate_many_preserves_order_and_defaults():
+    labels = translate_many(
+        ["report.diagnostics.code", "missing.key", "severity.high"],
+        "es",
+        defaults={"missing.key": "Fallback"},
+    )
+
+    assert labels == [
+        translate("report.diagnostics.code", "es"),
+        "Fallback",
+        translate("severity.high", "es"),
+    ]
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("flask", "werkzeug", "reportlab", "PIL")
+
+
+def _imported_packages(module):
+    code = f"import sys, {module}; print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["vehiclecodescan.cron.purge", "vehiclecodescan.cron.tier", "vehiclecodescan.email.outbox"])
+def test_cli_entry_points_skip_the_web_and_pdf_stack(module):
+    assert not _imported_packages(module) & set(HEAVY)
+
+
+def test_importing_the_package_is_lazy():
+    assert "flask" not in _imported_packages("vehiclecodescan")
+    assert "flask" not in _imported_packages("vehiclecodescan.report.batch")
@@ -1,5 +1,10 @@
 from vehiclecodescan.parser.foxwell import RawDiagnosticEntry
-from vehiclecodescan.parser.interpret import interpret_codes
+from vehiclecodescan.parser.interpret import (
+    MANUFACTURER_CACHE_SIZE,
+    _load_manufacturer_shard,
+    interpret_codes,
+    manufacturer_for_vin,
+)
 
 
 def test_interpret_known_and_unknown_codes():
@@ -17,3 +22,31 @@ def test_interpret_known_and_unknown_codes():
     assert interpreted[1].known is False
     assert interpreted[1].severity == "unknown"
     assert "P9999" in interpreted[1].description
+
+
+def test_manufacturer_codes_follow_the_vin():
+    entries = [RawDiagnosticEntry(code="P1259"), RawDiagnosticEntry(code="P0300")]
+
+    honda = interpret_codes(entries, "es", vin="1hgcm82633a004352")
+    generic = interpret_codes(entries, "en")
+
+    assert manufacturer_for_vin("JTDKB20U887654321") == "toyota"
+    assert manufacturer_for_vin("WVWZZZ1JZXW000001") is None
+    assert honda[0].known is True
+    assert "VTEC" in honda[0].description
+    assert honda[1].known is True
+    assert generic[0].known is False
+
+
+def test_manufacturer_shards_load_lazily_into_a_bounded_cache():
+    _load_manufacturer_shard.cache_clear()
+    entries = [RawDiagnosticEntry(code="P1000")]
+
+    interpret_codes(entries, "en")
+    assert _load_manufacturer_shard.cache_info().currsize == 0
+
+    for vin in ["1FAHP3F20CL000001", "1G1ZD5ST0JF000001", "1HGCM82633A000001", "4T1BF1FK5CU000001"]:
+        interpret_codes(entries, "en", vin=vin)
+    info = _load_manufacturer_shard.cache_info()
+    assert info.currsize == 4
+    assert info.maxsize == MANUFACTURER_CACHE_SIZE
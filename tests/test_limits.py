@@ -0,0 +1,63 @@
+from vehiclecodescan.web.limits import AdmissionController, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+
+    assert bucket.reserve(0) == (True, 0.0)
+    assert bucket.reserve(0) == (True, 0.0)
+    granted, retry_after = bucket.reserve(0)
+    assert granted is False
+    assert retry_after == 1.0
+
+    clock.now = 1.0
+    assert bucket.reserve(0) == (True, 0.0)
+
+
+def test_admission_controller_limits_per_client_and_slots():
+    clock = FakeClock()
+    controller = AdmissionController(
+        rate_per_minute=60, burst=1, max_concurrent=1, queue_timeout=0, clock=clock
+    )
+
+    assert controller.admit("alice") is None
+    assert controller.admit("alice") == 1.0
+    assert controller.admit("bob") is None
+
+    assert controller.acquire_slot() is True
+    assert controller.acquire_slot() is False
+    controller.release_slot()
+    assert controller.acquire_slot() is True
+
+
+def test_render_slots_are_taken_per_language_all_at_once():
+    controller = AdmissionController(rate_per_minute=0, burst=1, max_concurrent=3, queue_timeout=0)
+
+    assert controller.acquire_slot(2) is True
+    assert controller.acquire_slot(2) is False
+    assert controller.acquire_slot(1) is True
+    controller.release_slot(2)
+    controller.release_slot(1)
+    # More languages than slots take the whole pool instead of never fitting.
+    assert controller.acquire_slot(5) is True
+    assert controller.acquire_slot(1) is False
+
+
+def test_enter_refunds_the_token_when_no_slot_is_free():
+    controller = AdmissionController(rate_per_minute=60, burst=1, max_concurrent=1, queue_timeout=0)
+
+    assert controller.acquire_slot() is True
+    assert controller.enter("alice") == 1
+    controller.release_slot()
+
+    assert controller.enter("alice") is None
+    assert controller.enter("bob") == 1
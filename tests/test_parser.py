@@ -1,3 +1,5 @@
+import gzip
+
 from vehiclecodescan.parser.foxwell import parse_foxwell_output
 
 
@@ -22,3 +24,13 @@ def test_parse_foxwell_text(tmp_path):
 
     codes = {entry.code for entry in entries}
     assert codes == {"P0171", "P0442"}
+
+
+def test_parse_foxwell_compressed_csv(tmp_path):
+    csv_path = tmp_path / "sample.csv.gz"
+    with gzip.open(csv_path, "wt", encoding="utf-8") as handle:
+        handle.write("Code,Status\nP0300,Pending\n")
+
+    entries = parse_foxwell_output(csv_path)
+
+    assert [(entry.code, entry.source) for entry in entries] == [("P0300", "csv")]
@@ -0,0 +1,85 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from vehiclecodescan.cron.purge import evict_to_budget, purge_expired, sweep_orphans
+from vehiclecodescan.storage import models
+
+
+def _store(settings, report_id, age_days):
+    scanner = settings.upload_dir / f"{report_id}_scanner.txt"
+    pdf = settings.report_dir / f"{report_id}.pdf"
+    scanner.write_text("P0300", encoding="utf-8")
+    pdf.write_bytes(b"%PDF")
+    created_at = datetime.now(timezone.utc) - timedelta(days=age_days)
+    models.store_report(
+        settings,
+        report_id,
+        {"created_at": created_at, "scanner_file": str(scanner), "pdf_path": str(pdf), "image_paths": []},
+    )
+    return scanner, pdf
+
+
+def test_purge_expired_runs_in_batches(settings):
+    expired = [_store(settings, f"old{index}", 40) for index in range(5)]
+    fresh = _store(settings, "new", 1)
+
+    summary = purge_expired(days=30, batch_size=2, settings=settings)
+
+    assert (summary.reports, summary.files, summary.bytes) == (5, 10, 5 * (5 + 4))
+    assert [record.report_id for record in models.list_reports(settings)] == ["new"]
+    assert not any(path.exists() for paths in expired for path in paths)
+    assert all(path.exists() for path in fresh)
+
+
+def test_purge_dry_run_keeps_everything(settings):
+    paths = [_store(settings, f"old{index}", 40) for index in range(3)]
+
+    summary = purge_expired(days=30, batch_size=2, dry_run=True, settings=settings)
+
+    assert summary.reports == 3
+    assert len(models.list_reports(settings)) == 3
+    assert all(path.exists() for pair in paths for path in pair)
+
+
+def test_sweep_orphans_skips_known_and_recent_files(settings):
+    known = _store(settings, "known", 1)
+    orphan = settings.upload_dir / "gone_scanner.txt"
+    orphan.write_text("P0420", encoding="utf-8")
+    recent = settings.report_dir / "inflight.pdf"
+    recent.write_bytes(b"%PDF")
+    stale = time.time() - 2 * 3600
+    os.utime(orphan, (stale, stale))
+
+    dry = sweep_orphans(dry_run=True, settings=settings)
+    assert (dry.files, dry.bytes) == (1, 5)
+    assert orphan.exists()
+
+    summary = sweep_orphans(settings=settings)
+    assert summary.files == 1
+    assert not orphan.exists()
+    assert recent.exists()
+    assert all(path.exists() for path in known)
+
+
+def test_evict_to_budget_uses_tracked_sizes(settings):
+    for index in range(4):
+        _store(settings, f"r{index}", 4 - index)
+    models.touch_report(settings, "r0")
+    assert models.total_storage_bytes(settings) == 4 * 9
+
+    summary = evict_to_budget(2 * 9, policy="lru", batch_size=1, settings=settings)
+
+    assert summary.reports == 2
+    assert models.total_storage_bytes(settings) == 2 * 9
+    assert sorted(record.report_id for record in models.list_reports(settings)) == ["r0", "r3"]
+
+
+def test_purge_dry_run_pages_past_string_timestamps(settings):
+    for index in range(3):
+        models.store_report(settings, f"old{index}", {"created_at": "2020-01-01T00:00:00Z", "image_paths": []})
+
+    summary = purge_expired(days=30, batch_size=1, dry_run=True, settings=settings)
+
+    assert summary.reports == 3
+    assert len(models.list_reports(settings)) == 3
@@ -0,0 +1,18 @@
+from PIL import Image as PILImage
+from reportlab.platypus import Image
+
+from vehiclecodescan.report import generator
+
+
+def test_known_size_jpeg_matches_reportlab_image(tmp_path):
+    # _KnownSizeJpeg copies Image.__init__'s JPEG branch; a ReportLab upgrade
+    # that changes that branch should fail here rather than in a rendered PDF.
+    path = tmp_path / "photo.jpg"
+    PILImage.new("RGB", (1200, 800)).save(path, format="JPEG")
+
+    known = generator._KnownSizeJpeg(str(path), 1200, 800, 468.0, 312.0)
+    opened = Image(str(path), width=468.0, height=312.0)
+
+    assert vars(known) == vars(opened)
+    assert (known.imageWidth, known.imageHeight) == (1200, 800)
+    assert (known.drawWidth, known.drawHeight) == (468.0, 312.0)
@@ -0,0 +1,235 @@
+import base64
+import io
+import json
+import pstats
+import re
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from vehiclecodescan.app import create_app
+from vehiclecodescan.storage import models
+from vehiclecodescan.web import profiling
+from vehiclecodescan.web.auth import make_download_token
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"admin:password").decode()}
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setenv("APP_PRELOAD", "false")
+    monkeypatch.delenv("MAIL_SERVER", raising=False)
+    return create_app()
+
+
+@pytest.fixture
+def stored_report(app):
+    settings = app.config["SETTINGS"]
+    pdf_path = settings.report_dir / "abc123.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 " + bytes(range(256)) * 4)
+    models.store_report(settings, "abc123", {"pdf_path": str(pdf_path)})
+    return pdf_path
+
+
+def test_download_requires_auth(app, stored_report):
+    client = app.test_client()
+
+    assert client.get("/reports/abc123.pdf").status_code == 401
+    assert client.get("/reports/abc123.pdf?token=forged").status_code == 401
+    assert client.get("/reports/missing.pdf", headers=AUTH).status_code == 404
+
+
+def test_download_supports_etag_and_range(app, stored_report):
+    client = app.test_client()
+
+    response = client.get("/reports/abc123.pdf", headers=AUTH)
+    assert response.status_code == 200
+    assert response.mimetype == "application/pdf"
+    assert response.data == stored_report.read_bytes()
+    etag = response.headers["ETag"]
+
+    cached = client.get("/reports/abc123.pdf", headers={**AUTH, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    partial = client.get("/reports/abc123.pdf", headers={**AUTH, "Range": "bytes=0-8"})
+    assert partial.status_code == 206
+    assert partial.data == b"%PDF-1.4 "
+
+
+def test_download_accepts_signed_link(app, stored_report):
+    client = app.test_client()
+    with app.test_request_context():
+        token = make_download_token("abc123")
+        other = make_download_token("other")
+
+    assert client.get(f"/reports/abc123.pdf?token={token}").status_code == 200
+    assert client.get(f"/reports/abc123.pdf?token={other}").status_code == 401
+
+
+def _jpeg_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_upload_validates_jpeg_headers(app):
+    client = app.test_client()
+    data = {
+        "email": "owner@example.com",
+        "scanner_file": (io.BytesIO(b"P0300 pending"), "scan.txt"),
+        "images": [(io.BytesIO(b"not really a jpeg"), "fake.jpg")],
+    }
+
+    response = client.post("/", data=data, headers=AUTH)
+
+    assert "fake.jpg" in response.get_data(as_text=True)
+    assert models.list_reports(app.config["SETTINGS"]) == []
+
+
+def test_upload_renders_report_with_photos(app):
+    client = app.test_client()
+    data = {
+        "email": "owner@example.com",
+        "scanner_file": (io.BytesIO(b"P0300 pending"), "scan.txt"),
+        "images": [(io.BytesIO(_jpeg_bytes(1200, 800)), "front.jpg")],
+    }
+
+    response = client.post("/", data=data, headers=AUTH)
+
+    assert response.status_code == 200
+    (record,) = models.list_reports(app.config["SETTINGS"])
+    assert len(record.metadata["image_paths"]) == 1
+    assert Path(record.metadata["pdf_path"]).stat().st_size > 0
+
+
+def test_upload_renders_each_selected_language(app):
+    app.config["SETTINGS"].render_processes = 1
+    client = app.test_client()
+    data = {
+        "email": "owner@example.com",
+        "language": ["es", "en", "xx"],
+        "scanner_file": (io.BytesIO(b"P0300 pending"), "scan.txt"),
+    }
+
+    response = client.post("/", data=data, headers=AUTH)
+
+    assert response.status_code == 200
+    (record,) = models.list_reports(app.config["SETTINGS"])
+    report_dir = app.config["SETTINGS"].report_dir
+    assert record.metadata["languages"] == ["es", "en"]
+    assert record.metadata["pdf_path"] == str(report_dir / f"{record.report_id}.pdf")
+    assert record.metadata["pdf_paths"]["en"] == str(report_dir / f"{record.report_id}_en.pdf")
+    assert len(models.report_file_paths(record.metadata)) == 3
+
+    english = client.get(f"/reports/{record.report_id}.pdf?lang=en", headers=AUTH)
+    assert english.status_code == 200
+    assert english.data == Path(record.metadata["pdf_paths"]["en"]).read_bytes()
+    assert client.get(f"/reports/{record.report_id}.pdf?lang=fr", headers=AUTH).status_code == 404
+
+
+def test_upload_profile_is_captured_on_request(app):
+    settings = app.config["SETTINGS"]
+    settings.profile_keep = 1
+    client = app.test_client()
+
+    def upload(headers):
+        data = {
+            "email": "owner@example.com",
+            "language": ["en", "es"],
+            "scanner_file": (io.BytesIO(b"P0300 pending P0420 stored"), "scan.txt"),
+            "images": [(io.BytesIO(_jpeg_bytes(64, 48)), "front.jpg")],
+        }
+        assert client.post("/", data=data, headers=headers).status_code == 200
+
+    profiles = settings.storage_root / "profiles"
+    upload(AUTH)
+    assert not profiles.exists()
+
+    upload({**AUTH, "X-Profile": "1"})
+    upload({**AUTH, "X-Profile": "1"})
+
+    (dump,) = profiles.glob("*.prof")
+    details = json.loads(dump.with_suffix(".json").read_text())
+    assert dump.name.endswith(f"_{details['report_id']}.prof")
+    assert (details["codes"], details["images"]) == (2, 1)
+    assert set(details["pdf_bytes"]) == {"en", "es"}
+    functions = {name for _, _, name in pstats.Stats(str(dump)).stats}
+    assert "generate_report" in functions
+
+
+def test_upload_is_served_unprofiled_while_another_is_profiled(app):
+    client = app.test_client()
+    data = {
+        "email": "owner@example.com",
+        "scanner_file": (io.BytesIO(b"P0300 pending"), "scan.txt"),
+    }
+    with profiling._PROFILE_LOCK:
+        response = client.post("/", data=data, headers={**AUTH, "X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert not (app.config["SETTINGS"].storage_root / "profiles").exists()
+
+
+@pytest.fixture
+def mail_app(monkeypatch, app):
+    monkeypatch.setenv("MAIL_SERVER", "localhost")
+    monkeypatch.setenv("OUTBOX_BACKGROUND", "false")
+    return create_app()
+
+
+def _upload_for_email(client):
+    data = {
+        "email": "owner@example.com",
+        "language": ["en", "es"],
+        "scanner_file": (io.BytesIO(b"P0300 pending"), "scan.txt"),
+    }
+    assert client.post("/", data=data, headers=AUTH).status_code == 200
+
+
+def test_upload_queues_email_with_attachments(mail_app):
+    _upload_for_email(mail_app.test_client())
+
+    settings = mail_app.config["SETTINGS"]
+    (record,) = models.list_reports(settings)
+    (queued,) = models.list_outbox(settings)
+    assert queued.recipient == "owner@example.com"
+    assert queued.attachments == list(record.metadata["pdf_paths"].values())
+    assert queued.body.startswith("Attached is the diagnostic report")
+    assert "token=" not in queued.body
+
+
+def test_upload_queues_signed_links_over_attachment_limit(mail_app):
+    mail_app.config["SETTINGS"].mail.attachment_limit = 1
+    client = mail_app.test_client()
+    _upload_for_email(client)
+
+    settings = mail_app.config["SETTINGS"]
+    (record,) = models.list_reports(settings)
+    (queued,) = models.list_outbox(settings)
+    assert queued.attachments == []
+    assert queued.body.startswith("Your vehicle's diagnostic report is ready to download")
+    links = re.findall(r"http://localhost(/reports/\S+)", queued.body)
+    assert len(links) == 2
+    for link, lang in zip(links, ["en", "es"]):
+        response = client.get(link)
+        assert response.status_code == 200
+        assert response.data == Path(record.metadata["pdf_paths"][lang]).read_bytes()
+    assert client.get(links[0].replace("token=", "token=x")).status_code == 401
+
+
+def test_upload_over_rate_limit_gets_retry_after(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setenv("APP_PRELOAD", "false")
+    monkeypatch.setenv("APP_RATE_LIMIT_PER_MINUTE", "6")
+    monkeypatch.setenv("APP_RATE_LIMIT_BURST", "1")
+    monkeypatch.setenv("APP_ADMISSION_TIMEOUT", "0")
+    client = create_app().test_client()
+
+    assert client.post("/", data={}, headers=AUTH).status_code == 200
+    refused = client.post("/", data={}, headers=AUTH)
+
+    assert refused.status_code == 429
+    assert 9 <= int(refused.headers["Retry-After"]) <= 10
+    assert client.get("/", headers=AUTH).status_code == 200
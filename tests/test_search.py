@@ -0,0 +1,126 @@
+import base64
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vehiclecodescan.app import create_app
+from vehiclecodescan.storage import models
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"admin:password").decode()}
+
+
+def _metadata(vin, email, notes, codes, created_at=None):
+    return {
+        "created_at": created_at or datetime.now(timezone.utc),
+        "email": email,
+        "vehicle": {"vin": vin, "mileage": None, "notes": notes},
+        "codes": [{"code": code, "description": description} for code, description in codes],
+    }
+
+
+def _store(settings, report_id, vin, email, notes, codes, created_at=None):
+    models.store_report(settings, report_id, _metadata(vin, email, notes, codes, created_at))
+
+
+@pytest.fixture
+def populated(settings):
+    _store(settings, "r1", "1HGCM82633A004352", "ana@example.com", "Rough idle when cold", [("P0300", "Random misfire")])
+    _store(settings, "r2", "2T1BURHE0JC123456", "bob@shop.test", "Check engine light", [("P0420", "Catalyst efficiency")])
+    _store(settings, "r3", "1HGCM82633A999999", "carla@example.com", "", [("P0171", "System too lean")])
+    return settings
+
+
+def test_search_matches_partial_fields(populated):
+    assert [hit.report_id for hit in models.search_reports(populated, "A004")[2]] == ["r1"]
+    assert {hit.report_id for hit in models.search_reports(populated, "1HGCM826")[2]} == {"r1", "r3"}
+    assert [hit.report_id for hit in models.search_reports(populated, "shop.test")[2]] == ["r2"]
+    assert [hit.report_id for hit in models.search_reports(populated, "catalyst")[2]] == ["r2"]
+    assert [hit.report_id for hit in models.search_reports(populated, "P0171")[2]] == ["r3"]
+    assert [hit.report_id for hit in models.search_reports(populated, "1HGCM idle")[2]] == ["r1"]
+
+
+def test_search_paginates_and_ignores_short_terms(populated):
+    total, capped, page = models.search_reports(populated, "example.com", limit=1, offset=1)
+    assert (total, capped) == (2, False)
+    assert len(page) == 1
+    assert models.search_reports(populated, "P0") == (0, False, [])
+    assert models.search_reports(populated, 'idle"') == (0, False, [])
+
+
+def test_search_index_follows_store_and_delete(populated):
+    _store(populated, "r1", "JM1BK32F781234567", "ana@example.com", "", [])
+    assert models.search_reports(populated, "A004352")[0] == 0
+    assert [hit.report_id for hit in models.search_reports(populated, "JM1BK")[2]] == ["r1"]
+
+    models.delete_reports(populated, ["r1", "r2"])
+    assert models.search_reports(populated, "example.com")[0] == 1
+    assert models.search_reports(populated, "P0420")[0] == 0
+
+
+def test_search_endpoint(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setenv("APP_PRELOAD", "false")
+    app = create_app()
+    _store(app.config["SETTINGS"], "r1", "1HGCM82633A004352", "ana@example.com", "", [("P0300", "Random misfire")])
+    client = app.test_client()
+
+    assert client.get("/search?q=misfire").status_code == 401
+    response = client.get("/search?q=misfire&per_page=500", headers=AUTH)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["total"] == 1
+    assert data["per_page"] == 100
+    assert data["total_capped"] is False
+    assert data["results"][0]["report_id"] == "r1"
+    assert data["results"][0]["codes"] == ["P0300"]
+    assert data["results"][0]["download_url"] == "/reports/r1.pdf"
+
+
+def test_broad_search_lists_newest_first(populated, monkeypatch):
+    monkeypatch.setattr(models, "SEARCH_RANK_LIMIT", 1)
+    # Stored last, but scanned a week ago: a batch import of an old submission.
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    _store(populated, "r4", "3FADP4BJ0DM123456", "dev@example.com", "", [], created_at=week_ago)
+
+    total, capped, hits = models.search_reports(populated, "example.com")
+
+    assert (total, capped) == (2, True)
+    assert [hit.report_id for hit in hits] == ["r3", "r1", "r4"]
+    assert models.search_reports(populated, "shop.test")[:2] == (1, False)
+
+
+def test_search_index_is_backfilled_for_existing_reports(populated):
+    with models._connect(populated) as conn:
+        conn.execute("DROP TABLE reports_fts")
+        conn.commit()
+    models._INITIALIZED.clear()
+
+    assert [hit.report_id for hit in models.search_reports(populated, "P0420")[2]] == ["r2"]
+
+
+def test_search_survives_legacy_reports_table(settings):
+    # Before reports had an explicit id, the index was keyed on their implicit
+    # rowid; here those rowids no longer match the index, as after a VACUUM.
+    path = settings.storage_root / "metadata.db"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE reports (report_id TEXT PRIMARY KEY, created_at TEXT NOT NULL, metadata TEXT NOT NULL)")
+        conn.execute("CREATE VIRTUAL TABLE reports_fts USING fts5(vin, email, notes, codes)")
+        for rowid, report_id, vin in [(7, "r1", "1HGCM82633A004352"), (3, "r2", "2T1BURHE0JC123456")]:
+            metadata = _metadata(vin, f"{report_id}@example.com", "", [], datetime.now(timezone.utc).isoformat())
+            conn.execute(
+                "INSERT INTO reports (rowid, report_id, created_at, metadata) VALUES (?, ?, ?, ?)",
+                (rowid, report_id, metadata["created_at"], json.dumps(metadata)),
+            )
+            conn.execute(
+                "INSERT INTO reports_fts (rowid, vin, email, notes, codes) VALUES (?, ?, ?, ?, ?)",
+                (10 - rowid, *models.search_fields(metadata)),
+            )
+        conn.commit()
+    models._INITIALIZED.clear()
+
+    assert [hit.report_id for hit in models.search_reports(settings, "A004352")[2]] == ["r1"]
+    models.delete_reports(settings, ["r1"])
+    assert [hit.report_id for hit in models.search_reports(settings, "example.com")[2]] == ["r2"]
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from vehiclecodescan.cron.tier import compress_aging_uploads
+from vehiclecodescan.parser.foxwell import parse_foxwell_output
+from vehiclecodescan.storage import models
+
+
+def test_compress_aging_uploads_updates_metadata(settings):
+    content = "Code,Status\n" + "P0300,Pending\n" * 200
+    for report_id, age in (("old", 10), ("new", 1)):
+        scanner = settings.upload_dir / f"{report_id}_scanner.csv"
+        scanner.write_text(content, encoding="utf-8")
+        models.store_report(
+            settings,
+            report_id,
+            {"created_at": datetime.now(timezone.utc) - timedelta(days=age), "scanner_file": str(scanner)},
+        )
+
+    summary = compress_aging_uploads(days=7, settings=settings)
+
+    assert summary.files == 1
+    assert summary.bytes_after < summary.bytes_before
+    records = {record.report_id: record for record in models.list_reports(settings)}
+    compressed = Path(records["old"].metadata["scanner_file"])
+    assert compressed.name == "old_scanner.csv.gz"
+    assert not (settings.upload_dir / "old_scanner.csv").exists()
+    assert records["new"].metadata["scanner_file"].endswith("new_scanner.csv")
+    assert len(parse_foxwell_output(compressed)) == 200
+
+    assert compress_aging_uploads(days=7, settings=settings).files == 0
+
+
+def test_compress_aging_uploads_pages_past_string_timestamps(settings):
+    for index in range(3):
+        scanner = settings.upload_dir / f"old{index}_scanner.csv"
+        scanner.write_text("Code,Status\nP0300,Pending\n", encoding="utf-8")
+        models.store_report(
+            settings, f"old{index}", {"created_at": "2020-01-01T00:00:00Z", "scanner_file": str(scanner)}
+        )
+
+    assert compress_aging_uploads(days=7, batch_size=1, settings=settings).files == 3